@@ -30,7 +30,11 @@ import subprocess
 import importlib.util
 import os
 import json
-from typing import Dict, List, Any
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional
 
 # ============================================================================
 # SMART DEPENDENCY MANAGEMENT - AI Agent Prerequisites
@@ -162,10 +166,56 @@ if AI_CAPABILITIES['data_processing']:
 else:
     PANDAS_AVAILABLE = False
 
+# Optional fast JSON encoder for prompt payloads (standard json otherwise)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def to_pretty_json(data: Any) -> str:
+    """📦 2-space indented JSON for prompts - orjson when installed, json as fallback"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2)
+
 # ============================================================================
 # AI MODEL SETUP - Enhanced with Error Handling
 # ============================================================================
 
+def create_shared_http_clients():
+    """
+    🔌 SHARED CONNECTION POOL
+    
+    WHAT THIS FUNCTION DOES:
+    Builds one sync and one async httpx client with a bounded keep-alive pool.
+    The model below is created once and used by every agent, so all requests -
+    including the concurrent fan-out - reuse warm TCP/TLS connections instead
+    of opening new ones. HTTP/2 is enabled when the optional h2 package is
+    installed; otherwise HTTP/1.1 keep-alive is used.
+    
+    Returns (None, None) if httpx is unavailable, letting OpenAI use its defaults.
+    """
+    
+    try:
+        import httpx
+    except ImportError:
+        return None, None
+    
+    use_http2 = importlib.util.find_spec("h2") is not None
+    limits = httpx.Limits(max_connections=16, max_keepalive_connections=8)
+    
+    print(f"🔌 Shared HTTP connection pool ready ({'HTTP/2' if use_http2 else 'HTTP/1.1 keep-alive'})")
+    return (
+        httpx.Client(http2=use_http2, limits=limits),
+        httpx.AsyncClient(http2=use_http2, limits=limits)
+    )
+
 def initialize_ai_model():
     """
     🧠 SMART AI MODEL INITIALIZATION
@@ -188,13 +238,18 @@ def initialize_ai_model():
             print("⚠️ OpenAI API key not found - using fallback analysis")
             return None
         
+        # One connection pool for every agent's requests
+        http_client, http_async_client = create_shared_http_clients()
+        
         # Initialize with error handling
         llm = ChatOpenAI(
             openai_api_key=OPENAI_API_KEY,
             model="gpt-4o-mini",  # Cost-effective model
             temperature=0.7,      # Balance creativity and consistency
             max_tokens=2000,      # Reasonable response length
-            timeout=30            # Prevent hanging requests
+            timeout=30,           # Prevent hanging requests
+            http_client=http_client,
+            http_async_client=http_async_client
         )
         
         print("✅ AI model initialized successfully!")
@@ -207,6 +262,239 @@ def initialize_ai_model():
 # Initialize the AI model
 llm = initialize_ai_model()
 
+async def generate_ai_text(prompt: str, on_token: Optional[Callable[[str], None]] = None) -> str:
+    """
+    📡 ASYNC MODEL CALL WITH OPTIONAL STREAMING
+    
+    WHAT THIS FUNCTION DOES:
+    Without a callback it simply awaits the full response. With on_token, it
+    streams the response and calls on_token(text_so_far) after every chunk,
+    so the UI can show the answer while it is still being written.
+    """
+    
+    if on_token is None:
+        return await llm.apredict(prompt)
+    
+    text = ""
+    async for chunk in llm.astream(prompt):
+        text += getattr(chunk, 'content', str(chunk))
+        on_token(text)
+    return text
+
+# ============================================================================
+# SMART ROUTER - Reuse AI answers for near-identical financial profiles
+# ============================================================================
+
+class AgentRouter:
+    """
+    🧭 SMART MODEL ROUTER
+    
+    WHAT IT DOES:
+    - Fingerprints each agent request by structure rather than exact bytes:
+      income, expenses and every category amount in ~5% buckets, the set of
+      categories, surplus vs deficit, the number of debt categories, and any
+      extra inputs (goals, extra payment)
+    - Skips requests that carry transactions: agents quote their details, so
+      only identical transactions could share an answer - and those requests
+      already hit the exact result cache
+    - Keeps an AI answer as a template: every number in it must be one of the
+      request's own figures (income, expenses, net, a category amount, the
+      extra payment) and is stored as a slot for that figure
+    - Serves a near-identical profile by re-rendering the template with that
+      profile's figures, skipping the model call entirely
+    - Lets everything else fall through to the model as usual
+    
+    Answers quoting any other number (percentages, months, derived totals)
+    are never kept - they are only right for the profile that produced them.
+    Only AI answers are remembered - rule-based output is already instant.
+    """
+    
+    BUCKET_RATIO = 1.05
+    
+    # "$1,234.50", "1200", "15%" - the optional "%" marks numbers that can never be slots
+    NUMBER_PATTERN = re.compile(r'(\$?)(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?(%?)')
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.responses = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _bucket(self, amount: float) -> int:
+        """📏 Map an amount to a ~5%-wide logarithmic bucket (0 for nothing)"""
+        amount = abs(amount or 0)
+        if amount < 1:
+            return 0
+        return round(math.log(amount, self.BUCKET_RATIO))
+    
+    def fingerprint(self, agent_name: str, financial_data: Dict[str, Any], *extra_inputs) -> Optional[tuple]:
+        """🔎 Structural fingerprint of an agent request (None when it has transactions - never routed)"""
+        if financial_data.get('transactions'):
+            return None
+        
+        categories = financial_data.get('categories', {})
+        # Lower-case each category name once, not once per keyword
+        debt_count = sum(
+            1 for category_lower in map(str.lower, map(str, categories))
+            if any(keyword in category_lower for keyword in DebtAnalyzerAgent.DEBT_KEYWORDS)
+        )
+        net_cash_flow = (financial_data.get('total_income', 0) or 0) - (financial_data.get('total_expenses', 0) or 0)
+        
+        return (
+            agent_name,
+            self._bucket(financial_data.get('total_income', 0)),
+            self._bucket(financial_data.get('total_expenses', 0)),
+            tuple(sorted((str(category), self._bucket(amount)) for category, amount in categories.items())),
+            net_cash_flow < 0,
+            debt_count,
+            tuple(str(value).strip().lower() for value in extra_inputs)
+        )
+    
+    def _figures(self, financial_data: Dict[str, Any], extra_inputs: tuple) -> Dict[tuple, float]:
+        """🔢 The request's own figures, by slot name (signs live in the template text)"""
+        income = financial_data.get('total_income', 0) or 0
+        expenses = financial_data.get('total_expenses', 0) or 0
+        figures = {('income',): abs(income), ('expenses',): abs(expenses), ('net',): abs(income - expenses)}
+        
+        for category, amount in financial_data.get('categories', {}).items():
+            figures[('category', str(category))] = abs(amount or 0)
+        
+        for index, value in enumerate(extra_inputs):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                figures[('extra', index)] = abs(value)
+        
+        return figures
+    
+    def _template(self, response: str, figures: Dict[tuple, float]) -> Optional[List[Any]]:
+        """🧩 Split an answer into text and figure slots (None if any number is not a figure)"""
+        template = []
+        position = 0
+        
+        for match in self.NUMBER_PATTERN.finditer(response):
+            dollar, whole, fraction, percent = match.groups()
+            line_start = response.rfind("\n", 0, match.start()) + 1
+            
+            # "1. " at the start of a line is a list marker, not a figure
+            if (not dollar and not fraction and response[match.end():match.end() + 1] == "."
+                    and not response[line_start:match.start()].strip()):
+                continue
+            
+            if percent:
+                return None
+            
+            decimals = len(fraction) - 1 if fraction else 0
+            value = float(whole.replace(",", "") + (fraction or ""))
+            slots = tuple(slot for slot, figure in figures.items() if round(figure, decimals) == value)
+            if not slots:
+                return None
+            
+            template.append(response[position:match.start()])
+            template.append((slots, dollar, "," in whole or len(whole) <= 3, decimals))
+            position = match.end()
+        
+        template.append(response[position:])
+        return template
+    
+    def _render(self, template: List[Any], figures: Dict[tuple, float]) -> Optional[str]:
+        """🖨️ Fill a template's slots with this request's figures (None if they no longer fit)"""
+        parts = []
+        
+        for part in template:
+            if isinstance(part, str):
+                parts.append(part)
+                continue
+            
+            slots, dollar, grouped, decimals = part
+            values = {round(figures[slot], decimals) for slot in slots if slot in figures}
+            # Slots that shared one number must still agree, or the answer can't say which it meant
+            if len(values) != 1 or len(slots) != sum(slot in figures for slot in slots):
+                return None
+            
+            parts.append(f"{dollar}{values.pop():{',' if grouped else ''}.{decimals}f}")
+        
+        return "".join(parts)
+    
+    def lookup(self, fingerprint: tuple, financial_data: Dict[str, Any], *extra_inputs) -> Optional[str]:
+        """♻️ Earlier AI answer for this profile, re-rendered with its own figures"""
+        with self._lock:
+            if fingerprint not in self.responses:
+                return None
+            self.responses.move_to_end(fingerprint)
+            template = self.responses[fingerprint]
+        
+        return self._render(template, self._figures(financial_data, extra_inputs))
+    
+    def remember(self, fingerprint: tuple, response: Any, financial_data: Dict[str, Any], *extra_inputs) -> None:
+        """💾 Keep AI answers (marked 🤖) whose numbers are all the request's own figures"""
+        if fingerprint is None or not isinstance(response, str) or not response.startswith("🤖"):
+            return
+        
+        template = self._template(response, self._figures(financial_data, extra_inputs))
+        if template is None:
+            return
+        
+        with self._lock:
+            self.responses[fingerprint] = template
+            self.responses.move_to_end(fingerprint)
+            while len(self.responses) > self.max_entries:
+                self.responses.popitem(last=False)
+
+# ============================================================================
+# BATCHED AI ANALYSIS - One model call for all AI agents (token saver)
+# ============================================================================
+
+BATCHED_PROMPT_HEADER = """You are a team of financial specialists answering several tasks in ONE response.
+Complete every task below. Reply with ONLY a JSON object that has exactly these keys: {keys}.
+Each value must be the complete Markdown answer for that task, following its instructions.
+"""
+
+async def run_batched_ai_analysis(debt_agent, savings_agent, budget_agent,
+                                  financial_data: Dict[str, Any], goals: str = "",
+                                  columns: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """
+    🧾 SINGLE-CALL MULTI-AGENT ANALYSIS
+    
+    WHAT THIS FUNCTION DOES:
+    1. Collects each AI agent's prompt for this data
+    2. Sends them as sections of one JSON-mode request, so there is one
+       network round trip and one response instead of three
+    3. Returns {"debt_analysis", "savings_strategy", "budget_analysis"} with the
+       same "🤖 <agent> AI ..." headers the individual agents produce
+    
+    The savings section is only sent when goals are given (same rule as the
+    savings agent); otherwise its rule-based strategy is used. Raises if the
+    model is unavailable or the reply is not the expected JSON, so callers can
+    fall back to the per-agent calls.
+    """
+    
+    if llm is None:
+        raise RuntimeError("AI model not available")
+    
+    sections = {
+        'debt_analysis': (debt_agent, "AI Analysis", debt_agent.build_ai_prompt(financial_data, columns)),
+        'budget_analysis': (budget_agent, "AI Analysis", budget_agent.build_ai_prompt(financial_data))
+    }
+    if goals:
+        sections['savings_strategy'] = (savings_agent, "AI Strategy", savings_agent.build_ai_prompt(financial_data, goals))
+    
+    prompt_parts = [BATCHED_PROMPT_HEADER.format(keys=", ".join(f'"{key}"' for key in sections))]
+    for key, (_, _, section_prompt) in sections.items():
+        prompt_parts.append(f"=== TASK: {key} ===\n{section_prompt}")
+    
+    response = await llm.bind(response_format={"type": "json_object"}).ainvoke("\n\n".join(prompt_parts))
+    answers = json.loads(getattr(response, 'content', response))
+    
+    results = {}
+    for key, (agent, label, _) in sections.items():
+        answer = answers.get(key)
+        if not isinstance(answer, str) or not answer.strip():
+            raise ValueError(f"Batched response missing '{key}'")
+        results[key] = f"🤖 {agent.agent_name} {label}:\n\n{answer}"
+    
+    if 'savings_strategy' not in results:
+        results['savings_strategy'] = savings_agent.create_savings_plan(financial_data, goals)
+    
+    return results
+
 # ============================================================================
 # AGENT 1: ENHANCED DEBT ANALYZER AGENT 🏦
 # ============================================================================
@@ -237,14 +525,17 @@ class DebtAnalyzerAgent:
     def __init__(self):
         self.agent_name = "💳 Enhanced Debt Analyzer"
         self.ai_available = llm is not None
+        # Parsed once here instead of on every analysis
+        self.prompt_template = self._create_prompt_template() if LANGCHAIN_AVAILABLE else None
         print(f"🏦 Debt Analyzer Agent initialized ({'AI-powered' if self.ai_available else 'rule-based'})")
     
-    def analyze_debt(self, financial_data: Dict[str, Any]) -> str:
+    def analyze_debt(self, financial_data: Dict[str, Any], columns: Optional[Dict[str, Any]] = None) -> str:
         """
         ENHANCED DEBT ANALYSIS WITH SMART FALLBACKS
         
         INPUTS:
         - financial_data: Dictionary containing income, expenses, transactions
+        - columns: Optional struct-of-arrays view (data_processor.build_transaction_columns)
         
         OUTPUTS:
         - String with detailed debt analysis and recommendations
@@ -260,7 +551,7 @@ class DebtAnalyzerAgent:
         
         try:
             # STEP 1: Extract debt information
-            debts = self._identify_debts(financial_data)
+            debts = self._identify_debts(financial_data, columns)
             income = financial_data.get('total_income', 0)
             expenses = financial_data.get('total_expenses', 0)
             
@@ -277,14 +568,76 @@ class DebtAnalyzerAgent:
             print(f"❌ Error in debt analysis: {e}")
             return self._create_error_fallback("debt analysis", str(e), financial_data)
     
+    async def analyze_debt_async(self, financial_data: Dict[str, Any],
+                                 on_token: Optional[Callable[[str], None]] = None,
+                                 columns: Optional[Dict[str, Any]] = None) -> str:
+        """
+        ⚡ ASYNC DEBT ANALYSIS
+        
+        Same workflow as analyze_debt(), but the AI call is awaited instead of
+        blocking, so the coach can run all agents on one event loop. Pass
+        on_token to receive the AI text as it streams in.
+        """
+        
+        print("🏦 Analyzing debt patterns (async)...")
+        
+        try:
+            debts = self._identify_debts(financial_data, columns)
+            income = financial_data.get('total_income', 0)
+            expenses = financial_data.get('total_expenses', 0)
+            debt_metrics = self._calculate_debt_metrics(debts, income, expenses)
+            
+            if self.ai_available:
+                return await self._ai_debt_analysis_async(debts, debt_metrics, financial_data, on_token)
+            else:
+                return self._rule_based_debt_analysis(debts, debt_metrics, financial_data)
+                
+        except Exception as e:
+            print(f"❌ Error in debt analysis: {e}")
+            return self._create_error_fallback("debt analysis", str(e), financial_data)
+    
+    def build_ai_prompt(self, financial_data: Dict[str, Any], columns: Optional[Dict[str, Any]] = None) -> str:
+        """📝 Full AI prompt for this data (used when several agents share one model call)"""
+        debts = self._identify_debts(financial_data, columns)
+        debt_metrics = self._calculate_debt_metrics(
+            debts, financial_data.get('total_income', 0), financial_data.get('total_expenses', 0)
+        )
+        return self._build_debt_prompt(debts, debt_metrics, financial_data)
+    
     def _ai_debt_analysis(self, debts: List[Dict], debt_metrics: Dict, financial_data: Dict[str, Any]) -> str:
         """🤖 AI-powered debt analysis with personalized recommendations"""
         
         try:
-            # Create comprehensive prompt for AI
-            prompt_template = PromptTemplate(
-                input_variables=["debts", "metrics", "income", "expenses"],
-                template="""
+            prompt = self._build_debt_prompt(debts, debt_metrics, financial_data)
+            
+            # Get AI response
+            analysis = llm.predict(prompt)
+            return f"🤖 {self.agent_name} AI Analysis:\n\n{analysis}"
+            
+        except Exception as e:
+            print(f"❌ AI debt analysis failed: {e}")
+            # Fallback to rule-based analysis
+            return self._rule_based_debt_analysis(debts, debt_metrics, financial_data)
+    
+    async def _ai_debt_analysis_async(self, debts: List[Dict], debt_metrics: Dict, financial_data: Dict[str, Any],
+                                      on_token: Optional[Callable[[str], None]] = None) -> str:
+        """🤖 Async AI debt analysis (awaits or streams the model, same fallback rules)"""
+        
+        try:
+            prompt = self._build_debt_prompt(debts, debt_metrics, financial_data)
+            analysis = await generate_ai_text(prompt, on_token)
+            return f"🤖 {self.agent_name} AI Analysis:\n\n{analysis}"
+            
+        except Exception as e:
+            print(f"❌ AI debt analysis failed: {e}")
+            return self._rule_based_debt_analysis(debts, debt_metrics, financial_data)
+    
+    def _create_prompt_template(self):
+        """📝 Parse the debt counselor prompt template (called once, from __init__)"""
+        
+        return PromptTemplate(
+            input_variables=["debts", "metrics", "income", "expenses"],
+            template="""
                 You are a certified financial counselor with 20 years experience in debt management.
                 Analyze this client's debt situation and provide actionable advice:
                 
@@ -321,28 +674,22 @@ class DebtAnalyzerAgent:
                 Be encouraging but realistic. Use specific dollar amounts and timelines.
                 Focus on actionable advice that can be implemented immediately.
                 """
-            )
-            
-            # Format data for AI
-            debt_summary = json.dumps(debts, indent=2) if debts else "No specific debt payments identified in transactions"
-            metrics_summary = json.dumps(debt_metrics, indent=2)
-            
-            # Generate prompt
-            prompt = prompt_template.format(
-                debts=debt_summary,
-                metrics=metrics_summary,
-                income=financial_data.get('total_income', 0),
-                expenses=financial_data.get('total_expenses', 0)
-            )
-            
-            # Get AI response
-            analysis = llm.predict(prompt)
-            return f"🤖 {self.agent_name} AI Analysis:\n\n{analysis}"
-            
-        except Exception as e:
-            print(f"❌ AI debt analysis failed: {e}")
-            # Fallback to rule-based analysis
-            return self._rule_based_debt_analysis(debts, debt_metrics, financial_data)
+        )
+    
+    def _build_debt_prompt(self, debts: List[Dict], debt_metrics: Dict, financial_data: Dict[str, Any]) -> str:
+        """📝 Build the debt counselor prompt (shared by sync and async paths)"""
+        
+        # Format data for AI
+        debt_summary = to_pretty_json(debts) if debts else "No specific debt payments identified in transactions"
+        metrics_summary = to_pretty_json(debt_metrics)
+        
+        # Generate prompt
+        return self.prompt_template.format(
+            debts=debt_summary,
+            metrics=metrics_summary,
+            income=financial_data.get('total_income', 0),
+            expenses=financial_data.get('total_expenses', 0)
+        )
     
     def _rule_based_debt_analysis(self, debts: List[Dict], debt_metrics: Dict, financial_data: Dict[str, Any]) -> str:
         """📋 Professional rule-based debt analysis (fallback)"""
@@ -424,14 +771,20 @@ class DebtAnalyzerAgent:
         
         return f"📋 {self.agent_name} Professional Analysis:\n\n{analysis}"
     
-    def _identify_debts(self, financial_data: Dict[str, Any]) -> List[Dict]:
+    # Category fragments that mark a transaction as a debt payment
+    DEBT_KEYWORDS = [
+        'credit card', 'loan', 'mortgage', 'car payment', 'student loan', 
+        'debt', 'payment', 'financing', 'installment', 'lease'
+    ]
+    
+    def _identify_debts(self, financial_data: Dict[str, Any], columns: Optional[Dict[str, Any]] = None) -> List[Dict]:
         """Enhanced debt identification with better pattern recognition"""
         
+        if columns is not None:
+            return self._identify_debts_columnar(financial_data, columns)
+        
         debts = []
-        debt_keywords = [
-            'credit card', 'loan', 'mortgage', 'car payment', 'student loan', 
-            'debt', 'payment', 'financing', 'installment', 'lease'
-        ]
+        debt_keywords = self.DEBT_KEYWORDS
         
         for transaction in financial_data.get('transactions', []):
             description = transaction.get('category', '').lower()
@@ -448,6 +801,28 @@ class DebtAnalyzerAgent:
         
         return debts
     
+    def _identify_debts_columnar(self, financial_data: Dict[str, Any], columns: Dict[str, Any]) -> List[Dict]:
+        """⚡ Same result as _identify_debts, using the struct-of-arrays view (keyword test once per category)"""
+        
+        import numpy as np
+        
+        is_debt_category = np.array(
+            [any(keyword in category_lower for keyword in self.DEBT_KEYWORDS) for category_lower in map(str.lower, columns['category_names'])],
+            dtype=bool
+        )
+        debt_mask = (columns['amounts'] < 0) & is_debt_category[columns['category_codes']]
+        
+        transactions = financial_data.get('transactions', [])
+        return [
+            {
+                'type': transactions[i].get('category'),
+                'amount': abs(transactions[i].get('amount', 0)),
+                'date': transactions[i].get('date'),
+                'description': transactions[i].get('description', '')
+            }
+            for i in np.flatnonzero(debt_mask)
+        ]
+    
     def _calculate_debt_metrics(self, debts: List[Dict], income: float, expenses: float) -> Dict:
         """Calculate comprehensive debt health metrics"""
         
@@ -512,6 +887,8 @@ class SavingsStrategyAgent:
     def __init__(self):
         self.agent_name = "💰 Enhanced Savings Strategist"
         self.ai_available = llm is not None
+        # Parsed once here instead of on every analysis
+        self.prompt_template = self._create_prompt_template() if LANGCHAIN_AVAILABLE else None
         print(f"💰 Savings Strategy Agent initialized ({'AI-powered' if self.ai_available else 'rule-based'})")
     
     def create_savings_plan(self, financial_data: Dict[str, Any], goals: str = "") -> str:
@@ -553,13 +930,71 @@ class SavingsStrategyAgent:
             print(f"❌ Error in savings strategy: {e}")
             return self._create_savings_fallback("savings strategy", str(e), financial_data)
     
+    async def create_savings_plan_async(self, financial_data: Dict[str, Any], goals: str = "",
+                                        on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        ⚡ ASYNC SAVINGS STRATEGY
+        
+        Same workflow as create_savings_plan(), with the AI call awaited
+        (or streamed to on_token when given).
+        """
+        
+        print("💰 Creating personalized savings strategy (async)...")
+        
+        try:
+            income = financial_data.get('total_income', 0)
+            expenses = financial_data.get('total_expenses', 0)
+            available_for_savings = max(0, income - expenses)
+            savings_metrics = self._calculate_savings_metrics(income, expenses, available_for_savings)
+            
+            if self.ai_available and goals:
+                return await self._ai_savings_strategy_async(savings_metrics, financial_data, goals, on_token)
+            else:
+                return self._rule_based_savings_strategy(savings_metrics, financial_data, goals)
+                
+        except Exception as e:
+            print(f"❌ Error in savings strategy: {e}")
+            return self._create_savings_fallback("savings strategy", str(e), financial_data)
+    
+    def build_ai_prompt(self, financial_data: Dict[str, Any], goals: str) -> str:
+        """📝 Full AI prompt for this data (used when several agents share one model call)"""
+        income = financial_data.get('total_income', 0)
+        expenses = financial_data.get('total_expenses', 0)
+        savings_metrics = self._calculate_savings_metrics(income, expenses, max(0, income - expenses))
+        return self._build_savings_prompt(savings_metrics, financial_data, goals)
+    
     def _ai_savings_strategy(self, metrics: Dict, financial_data: Dict[str, Any], goals: str) -> str:
         """🤖 AI-powered personalized savings strategy"""
         
         try:
-            prompt_template = PromptTemplate(
-                input_variables=["metrics", "categories", "goals", "income"],
-                template="""
+            prompt = self._build_savings_prompt(metrics, financial_data, goals)
+            
+            strategy = llm.predict(prompt)
+            return f"🤖 {self.agent_name} AI Strategy:\n\n{strategy}"
+            
+        except Exception as e:
+            print(f"❌ AI savings strategy failed: {e}")
+            return self._rule_based_savings_strategy(metrics, financial_data, goals)
+    
+    async def _ai_savings_strategy_async(self, metrics: Dict, financial_data: Dict[str, Any], goals: str,
+                                         on_token: Optional[Callable[[str], None]] = None) -> str:
+        """🤖 Async AI savings strategy (awaits or streams the model, same fallback rules)"""
+        
+        try:
+            prompt = self._build_savings_prompt(metrics, financial_data, goals)
+            strategy = await generate_ai_text(prompt, on_token)
+            return f"🤖 {self.agent_name} AI Strategy:\n\n{strategy}"
+            
+        except Exception as e:
+            print(f"❌ AI savings strategy failed: {e}")
+            return self._rule_based_savings_strategy(metrics, financial_data, goals)
+    
+    def _create_prompt_template(self):
+        """📝 Parse the savings planner prompt template (called once, from __init__)"""
+        
+        return PromptTemplate(
+            input_variables=["metrics", "categories", "goals", "income"],
+            template="""
                 You are a certified financial planner specializing in savings strategies.
                 Create a personalized savings plan for this client:
                 
@@ -609,25 +1044,21 @@ class SavingsStrategyAgent:
                 Make it actionable with specific dollar amounts, percentages, and timelines.
                 Focus on behavioral psychology - what will actually work for this person.
                 """
-            )
-            
-            # Format data for AI
-            metrics_summary = json.dumps(metrics, indent=2)
-            categories_summary = json.dumps(financial_data.get('categories', {}), indent=2)
-            
-            prompt = prompt_template.format(
-                metrics=metrics_summary,
-                categories=categories_summary,
-                goals=goals or "Build financial security and achieve financial independence",
-                income=financial_data.get('total_income', 0)
-            )
-            
-            strategy = llm.predict(prompt)
-            return f"🤖 {self.agent_name} AI Strategy:\n\n{strategy}"
-            
-        except Exception as e:
-            print(f"❌ AI savings strategy failed: {e}")
-            return self._rule_based_savings_strategy(metrics, financial_data, goals)
+        )
+    
+    def _build_savings_prompt(self, metrics: Dict, financial_data: Dict[str, Any], goals: str) -> str:
+        """📝 Build the savings planner prompt (shared by sync and async paths)"""
+        
+        # Format data for AI
+        metrics_summary = to_pretty_json(metrics)
+        categories_summary = to_pretty_json(financial_data.get('categories', {}))
+        
+        return self.prompt_template.format(
+            metrics=metrics_summary,
+            categories=categories_summary,
+            goals=goals or "Build financial security and achieve financial independence",
+            income=financial_data.get('total_income', 0)
+        )
     
     def _rule_based_savings_strategy(self, metrics: Dict, financial_data: Dict[str, Any], goals: str) -> str:
         """📋 Professional rule-based savings strategy"""
@@ -838,6 +1269,8 @@ class BudgetAdvisorAgent:
     def __init__(self):
         self.agent_name = "📋 Enhanced Budget Advisor"
         self.ai_available = llm is not None
+        # Parsed once here instead of on every analysis
+        self.prompt_template = self._create_prompt_template() if LANGCHAIN_AVAILABLE else None
         print(f"📋 Budget Advisor Agent initialized ({'AI-powered' if self.ai_available else 'rule-based'})")
     
     def analyze_budget(self, financial_data: Dict[str, Any]) -> str:
@@ -875,13 +1308,71 @@ class BudgetAdvisorAgent:
             print(f"❌ Error in budget analysis: {e}")
             return self._create_budget_fallback("budget analysis", str(e), financial_data)
     
+    async def analyze_budget_async(self, financial_data: Dict[str, Any],
+                                   on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        ⚡ ASYNC BUDGET ANALYSIS
+        
+        Same workflow as analyze_budget(), with the AI call awaited
+        (or streamed to on_token when given).
+        """
+        
+        print("📋 Analyzing budget and spending patterns (async)...")
+        
+        try:
+            income = financial_data.get('total_income', 0)
+            expenses = financial_data.get('total_expenses', 0)
+            categories = financial_data.get('categories', {})
+            
+            if self.ai_available:
+                return await self._ai_budget_analysis_async(income, expenses, categories, on_token)
+            else:
+                return self._rule_based_budget_analysis(income, expenses, categories)
+                
+        except Exception as e:
+            print(f"❌ Error in budget analysis: {e}")
+            return self._create_budget_fallback("budget analysis", str(e), financial_data)
+    
+    def build_ai_prompt(self, financial_data: Dict[str, Any]) -> str:
+        """📝 Full AI prompt for this data (used when several agents share one model call)"""
+        return self._build_budget_prompt(
+            financial_data.get('total_income', 0),
+            financial_data.get('total_expenses', 0),
+            financial_data.get('categories', {})
+        )
+    
     def _ai_budget_analysis(self, income: float, expenses: float, categories: Dict) -> str:
         """🤖 AI-powered budget analysis"""
         
         try:
-            prompt_template = PromptTemplate(
-                input_variables=["income", "expenses", "categories"],
-                template="""
+            prompt = self._build_budget_prompt(income, expenses, categories)
+            
+            advice = llm.predict(prompt)
+            return f"🤖 {self.agent_name} AI Analysis:\n\n{advice}"
+            
+        except Exception as e:
+            print(f"❌ AI budget analysis failed: {e}")
+            return self._rule_based_budget_analysis(income, expenses, categories)
+    
+    async def _ai_budget_analysis_async(self, income: float, expenses: float, categories: Dict,
+                                        on_token: Optional[Callable[[str], None]] = None) -> str:
+        """🤖 Async AI budget analysis (awaits or streams the model, same fallback rules)"""
+        
+        try:
+            prompt = self._build_budget_prompt(income, expenses, categories)
+            advice = await generate_ai_text(prompt, on_token)
+            return f"🤖 {self.agent_name} AI Analysis:\n\n{advice}"
+            
+        except Exception as e:
+            print(f"❌ AI budget analysis failed: {e}")
+            return self._rule_based_budget_analysis(income, expenses, categories)
+    
+    def _create_prompt_template(self):
+        """📝 Parse the budget expert prompt template (called once, from __init__)"""
+        
+        return PromptTemplate(
+            input_variables=["income", "expenses", "categories"],
+            template="""
                 You are a budget expert analyzing spending patterns.
                 
                 💵 SPENDING ANALYSIS:
@@ -901,20 +1392,16 @@ class BudgetAdvisorAgent:
                 Use 50/30/20 rule: 50% needs (rent, utilities, groceries), 
                 30% wants (entertainment, dining out), 20% savings/debt repayment.
                 """
-            )
-            
-            prompt = prompt_template.format(
-                income=income,
-                expenses=expenses,
-                categories=json.dumps(categories, indent=2)
-            )
-            
-            advice = llm.predict(prompt)
-            return f"🤖 {self.agent_name} AI Analysis:\n\n{advice}"
-            
-        except Exception as e:
-            print(f"❌ AI budget analysis failed: {e}")
-            return self._rule_based_budget_analysis(income, expenses, categories)
+        )
+    
+    def _build_budget_prompt(self, income: float, expenses: float, categories: Dict) -> str:
+        """📝 Build the budget expert prompt (shared by sync and async paths)"""
+        
+        return self.prompt_template.format(
+            income=income,
+            expenses=expenses,
+            categories=to_pretty_json(categories)
+        )
     
     def _rule_based_budget_analysis(self, income: float, expenses: float, categories: Dict) -> str:
         """📋 Professional rule-based budget analysis"""
@@ -1187,12 +1674,15 @@ class OptimizedPayoffAgent:
         self.agent_name = "💡 Optimized Payoff Agent"
         print(f"{self.agent_name} initialized")
 
+    # Category name fragments that mark a debt payment
+    DEBT_CATEGORY_KEYWORDS = ("loan", "credit", "debt")
+
     def create_payoff_plan(self, financial_data, extra_payment=0):
         categories = financial_data.get("categories", {})
-        total_debt = 0
-        for cat, amount in categories.items():
-            if "loan" in cat.lower() or "credit" in cat.lower() or "debt" in cat.lower():
-                total_debt += amount
+        total_debt = sum(
+            amount for cat_lower, amount in zip(map(str.lower, categories), categories.values())
+            if any(keyword in cat_lower for keyword in self.DEBT_CATEGORY_KEYWORDS)
+        )
 
         if total_debt <= 0:
             return "✅ No debts detected. Keep saving and investing!"
@@ -1208,6 +1698,10 @@ class OptimizedPayoffAgent:
         • Reinvest payments as each debt clears.
         """
 
+    async def create_payoff_plan_async(self, financial_data, extra_payment=0):
+        """Async entry point so the coach can gather it with the AI agents (pure math, no I/O)"""
+        return self.create_payoff_plan(financial_data, extra_payment)
+
 # ============================================================================
 # AGENT 5: FINANCIAL REPORT AGENT 📊
 # ============================================================================
@@ -5,7 +5,14 @@
 import sys
 import subprocess
 import os
+import json
+import asyncio
+import hashlib
+import threading
 import importlib.util
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 
 # ============================================================================
 # PREREQUISITE CHECKER - Smart Dependency Management
@@ -29,14 +36,11 @@ def check_and_install_dependencies():
     missing_packages = []
     
     for import_name, install_name in required_packages.items():
-        try:
-            if '.' in import_name:
-                main_module = import_name.split('.')[0]
-                importlib.import_module(main_module)
-            else:
-                importlib.import_module(import_name)
+        # find_spec only locates the package - it does not run its (slow) __init__
+        main_module = import_name.split('.')[0]
+        if importlib.util.find_spec(main_module) is not None:
             print(f"✅ {install_name} - already installed")
-        except ImportError:
+        else:
             print(f"⚠️ {install_name} - missing")
             missing_packages.append(install_name)
     
@@ -107,49 +111,176 @@ def system_diagnostics():
     print("✅ System diagnostics complete!")
 
 # ============================================================================
-# SMART IMPORTS WITH FALLBACKS
+# SMART IMPORTS WITH FALLBACKS - Deferred until first use
 # ============================================================================
+# Gradio, LangChain (via agents), pandas and plotly take seconds to import.
+# Only cheap availability probes run at import time; the modules themselves
+# are loaded by _gr() and load_coach_modules() when they are first needed,
+# which is after main() has finished its dependency checks.
 
-try:
-    import gradio as gr
-    GRADIO_AVAILABLE = True
-except ImportError:
+GRADIO_AVAILABLE = importlib.util.find_spec("gradio") is not None
+if not GRADIO_AVAILABLE:
     print("⚠️ Gradio not found - will attempt to install automatically")
-    GRADIO_AVAILABLE = False
 
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
+if not PANDAS_AVAILABLE:
     print("⚠️ Pandas not found - will attempt to install automatically")
-    PANDAS_AVAILABLE = False
 
+# Optional fast JSON encoder for cache keys (standard json otherwise)
 try:
-    from agents import (
-        DebtAnalyzerAgent,
-        SavingsStrategyAgent,
-        BudgetAdvisorAgent,
-        OptimizedPayoffAgent,
-        FinancialReportAgent
-    )
-    AGENTS_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ AI Agents import issue: {e}")
-    AGENTS_AVAILABLE = False
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-try:
-    from data_processor import FinancialDataProcessor, create_sample_data
-    DATA_PROCESSOR_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Data Processor import issue: {e}")
-    DATA_PROCESSOR_AVAILABLE = False
+# Set by load_coach_modules()
+AGENTS_AVAILABLE = False
+DATA_PROCESSOR_AVAILABLE = False
+VISUALIZER_AVAILABLE = False
 
-try:
-    from visualizer import FinancialVisualizer
-    VISUALIZER_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Visualizer import issue: {e}")
-    VISUALIZER_AVAILABLE = False
+@cache
+def _gr():
+    """🎨 Import gradio once, on first use"""
+    import gradio
+    return gradio
+
+@cache
+def load_coach_modules():
+    """
+    📦 LOAD AGENT, PROCESSOR AND VISUALIZER MODULES ON FIRST USE
+    
+    WHAT THIS FUNCTION DOES:
+    Imports agents, data_processor and visualizer (and with them LangChain,
+    pandas and plotly) the first time a coach is created, setting the same
+    *_AVAILABLE flags the rest of the app checks. Runs only once per process.
+    """
+    global AGENTS_AVAILABLE, DATA_PROCESSOR_AVAILABLE, VISUALIZER_AVAILABLE
+    global DebtAnalyzerAgent, SavingsStrategyAgent, BudgetAdvisorAgent, OptimizedPayoffAgent, FinancialReportAgent
+    global AgentRouter, run_batched_ai_analysis
+    global FinancialDataProcessor, create_sample_data, copy_plain_data, build_transaction_columns
+    global FinancialVisualizer
+    
+    try:
+        from agents import (
+            DebtAnalyzerAgent,
+            SavingsStrategyAgent,
+            BudgetAdvisorAgent,
+            OptimizedPayoffAgent,
+            FinancialReportAgent,
+            AgentRouter,
+            run_batched_ai_analysis
+        )
+        AGENTS_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ AI Agents import issue: {e}")
+        AGENTS_AVAILABLE = False
+    
+    try:
+        from data_processor import FinancialDataProcessor, create_sample_data, copy_plain_data, build_transaction_columns
+        DATA_PROCESSOR_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ Data Processor import issue: {e}")
+        DATA_PROCESSOR_AVAILABLE = False
+    
+    try:
+        from visualizer import FinancialVisualizer
+        VISUALIZER_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ Visualizer import issue: {e}")
+        VISUALIZER_AVAILABLE = False
+
+# ============================================================================
+# AGENT RESULT CACHE - Skip repeat LLM calls for identical inputs
+# ============================================================================
+
+AGENT_CACHE_MAX_ENTRIES = 128
+DOCUMENT_CACHE_MAX_ENTRIES = 8
+
+# Send the debt/savings/budget prompts as one model call instead of three
+BATCH_AGENT_CALLS = os.getenv("FINWISE_BATCH_LLM_CALLS", "").lower() in ("1", "true", "yes")
+
+# Shared by every coach instance; kept in memory only so financial data never hits disk
+_agent_result_cache = OrderedDict()
+_agent_cache_lock = threading.Lock()
+
+# Renders dashboards in the background while analyze_finances runs its agents -
+# one shared pool (threads start on first use), not a new executor per request
+_dashboard_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+
+def _canonicalize(value):
+    """🔢 Normalize values for hashing: sorted dict keys, amounts rounded to cents"""
+    if isinstance(value, dict):
+        return {str(k): _canonicalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalize(v) for v in value]
+    if isinstance(value, float):
+        return round(value, 2)
+    return value
+
+def canonical_json_bytes(value):
+    """📦 Compact, key-sorted JSON bytes for hashing (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY, default=str
+            )
+        except TypeError:
+            pass
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+def financial_data_digest(financial_data):
+    """🧮 Content hash of a request's financial data - computed once per analysis, shared by every agent's key"""
+    return hashlib.blake2b(canonical_json_bytes(_canonicalize(financial_data)), digest_size=16).hexdigest()
+
+def agent_cache_key(agent_name, data_digest, *extra_inputs):
+    """
+    🔑 CONTENT-ADDRESSED CACHE KEY
+    
+    WHAT THIS FUNCTION DOES:
+    Hashes the agent name, the financial data's digest (financial_data_digest)
+    and the agent's other inputs (goals, extra payment) into a stable key. Dict
+    keys are sorted and amounts rounded to cents first, so byte-identical
+    uploads always map to the same entry.
+    """
+    return hashlib.blake2b(canonical_json_bytes(_canonicalize([agent_name, data_digest, *extra_inputs])), digest_size=16).hexdigest()
+
+def _is_cacheable_result(result):
+    """✅ Only cache real results - never exceptions or the agents' ❌ error fallbacks"""
+    return isinstance(result, str) and not result.lstrip().startswith("❌")
+
+# ============================================================================
+# STATIC RESPONSE TEMPLATES - Built once at import, reused on every error
+# ============================================================================
+
+_DASHBOARD_PLACEHOLDER_HTML = """
+                <div style="text-align: center; padding: 50px; background: #f8f9fa; border-radius: 10px;">
+                    <h3>📊 Dashboard</h3>
+                    <p>Interactive dashboard requires full setup completion.</p>
+                </div>
+                """
+
+_ERROR_REPORT_TEMPLATE = """
+            ❌ **Error Processing Your Financial Analysis**
+            
+            **What happened:** {error}
+            
+            **Possible causes:**
+            - Missing OpenAI API key
+            - Missing required modules
+            - File format issues
+            
+            **Solutions:**
+            1. Set OPENAI_API_KEY environment variable
+            2. Check all required files are present
+            3. Try with sample data (no file upload)
+            """
+
+_ERROR_DASHBOARD_HTML = """
+            <div style="text-align: center; padding: 50px; background: #f8f9fa; border-radius: 10px;">
+                <h2 style="color: #dc3545;">📊 Dashboard Temporarily Unavailable</h2>
+                <p>Please resolve the error above to access dashboard.</p>
+            </div>
+            """
 
 # ============================================================================
 # MAIN APPLICATION CLASS
@@ -162,6 +293,8 @@ class AIFinancialCoach:
         """Initialize all AI agents and supporting modules"""
         print("🚀 Initializing FinWise AI...")
         
+        load_coach_modules()
+        
         try:
             if AGENTS_AVAILABLE:
                 self.debt_analyzer = DebtAnalyzerAgent()
@@ -169,6 +302,7 @@ class AIFinancialCoach:
                 self.budget_advisor = BudgetAdvisorAgent()
                 self.payoff_optimizer = OptimizedPayoffAgent()
                 self.report_generator = FinancialReportAgent()
+                self.router = AgentRouter()
                 print("✅ All AI agents initialized successfully!")
             else:
                 print("⚠️ AI agents not available - using fallback mode")
@@ -185,57 +319,395 @@ class AIFinancialCoach:
         except Exception as e:
             print(f"⚠️ Warning: Supporting modules initialization issue: {e}")
         
+        self.agent_cache = _agent_result_cache
+        
+        # Parsed uploads keyed on (path, mtime, size) - re-analysis skips re-parsing
+        self._doc_cache = OrderedDict()
+        self._doc_cache_lock = threading.Lock()
+        
         print("🎉 FinWise AI ready for action!")
     
-    def analyze_finances(self, file_upload, financial_goals, extra_payment):
-        """Main financial analysis function"""
+    def analyze_finances(self, file_upload, financial_goals, extra_payment, force_refresh=False):
+        """Main financial analysis function (force_refresh=True bypasses the agent cache)"""
         print("📄 Starting financial analysis workflow...")
         
         try:
             # Process financial data
-            if file_upload is not None and DATA_PROCESSOR_AVAILABLE:
-                print(f"📤 Processing uploaded file: {file_upload.name}")
-                financial_data = self.data_processor.process_document(file_upload.name)
-                if "error" in financial_data:
-                    financial_data = create_sample_data()
-                    report_note = "⚠️ Using sample data due to file processing error. "
-                else:
-                    report_note = "✅ Successfully processed your financial document. "
-            else:
-                if DATA_PROCESSOR_AVAILABLE:
-                    financial_data = create_sample_data()
-                else:
-                    # Fallback sample data
-                    financial_data = {
-                        'total_income': 5000,
-                        'total_expenses': 3500,
-                        'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300, 'Utilities': 200}
-                    }
-                report_note = "📊 Using sample financial data for demonstration. "
+            financial_data, report_note = self._load_financial_data(file_upload)
+            data_digest = financial_data_digest(financial_data)
+            
+            # The dashboard only needs financial_data, so render it while the agents run
+            dashboard_future = _dashboard_executor.submit(self._create_dashboard, financial_data)
             
             # Run AI analysis if available
             if AGENTS_AVAILABLE and hasattr(self, 'report_generator'):
                 print("🤖 Running AI financial analysis agents...")
                 
-                debt_analysis = self.debt_analyzer.analyze_debt(financial_data)
-                savings_strategy = self.savings_strategist.create_savings_plan(financial_data, financial_goals)
-                budget_advice = self.budget_advisor.analyze_budget(financial_data)
+                # Columnar view built once and shared with the agents that scan transactions
+                columns = build_transaction_columns(financial_data) if DATA_PROCESSOR_AVAILABLE else None
+                
+                debt_analysis = self._cached_agent_call(
+                    "debt", self.debt_analyzer.analyze_debt, financial_data,
+                    bypass_cache=force_refresh, data_digest=data_digest, columns=columns
+                )
+                savings_strategy = self._cached_agent_call(
+                    "savings", self.savings_strategist.create_savings_plan, financial_data, financial_goals,
+                    bypass_cache=force_refresh, data_digest=data_digest
+                )
+                budget_advice = self._cached_agent_call(
+                    "budget", self.budget_advisor.analyze_budget, financial_data,
+                    bypass_cache=force_refresh, data_digest=data_digest
+                )
                 
                 extra_payment_amount = float(extra_payment) if extra_payment else 0
-                payoff_plan = self.payoff_optimizer.create_payoff_plan(financial_data, extra_payment_amount)
+                payoff_plan = self._cached_agent_call(
+                    "payoff", self.payoff_optimizer.create_payoff_plan, financial_data, extra_payment_amount,
+                    bypass_cache=force_refresh, data_digest=data_digest
+                )
                 
                 comprehensive_report = self.report_generator.generate_report(
                     debt_analysis, savings_strategy, budget_advice, payoff_plan, financial_data
                 )
             else:
-                # Fallback analysis
-                print("📊 Generating fallback financial analysis...")
-                income = financial_data.get('total_income', 0)
-                expenses = financial_data.get('total_expenses', 0)
-                net_savings = income - expenses
-                savings_rate = (net_savings / income * 100) if income > 0 else 0
+                comprehensive_report = self._create_fallback_report(financial_data)
+            
+            # Collect the dashboard rendered in the background
+            financial_dashboard = dashboard_future.result()
+            
+            return report_note + comprehensive_report, financial_dashboard
+            
+        except Exception as e:
+            print(f"❌ Error during financial analysis: {e}")
+            return self._create_error_response(e)
+    
+    async def analyze_finances_async(self, file_upload, financial_goals, extra_payment, force_refresh=False):
+        """
+        ⚡ ASYNC FINANCIAL ANALYSIS
+        
+        WHAT THIS FUNCTION DOES:
+        Same result as analyze_finances(), but the four independent agents run
+        concurrently (see stream_finances_async). The debt, savings and budget
+        agents each make their own model call, so total wait time is roughly the
+        slowest call instead of the sum of all three.
+        """
+        result = None
+        async for result in self.stream_finances_async(file_upload, financial_goals, extra_payment, force_refresh):
+            pass
+        return result
+    
+    async def stream_finances_async(self, file_upload, financial_goals, extra_payment, force_refresh=False):
+        """
+        📡 STREAMING FINANCIAL ANALYSIS
+        
+        WHAT THIS FUNCTION DOES:
+        1. Parses the document in a worker thread (event loop stays free)
+        2. Starts the dashboard render in the background
+        3. Runs all four agents concurrently with asyncio.gather
+        4. Yields (partial_report, None) whenever an agent streams new text or
+           finishes, so the report fills in while the model is still writing
+        5. Yields (final_report, dashboard) once everything is done
+        
+        All agents share the module-level model client in agents.py, so the
+        concurrent calls reuse one connection pool. Results go through the
+        agent cache; force_refresh=True skips cached entries.
+        """
+        print("📄 Starting financial analysis workflow (async)...")
+        
+        try:
+            # Process financial data off the event loop
+            financial_data, report_note = await asyncio.to_thread(self._load_financial_data, file_upload)
+            data_digest = await asyncio.to_thread(financial_data_digest, financial_data)
+            
+            # The dashboard only needs financial_data, so render it while the agents run
+            dashboard_task = asyncio.create_task(asyncio.to_thread(self._create_dashboard, financial_data))
+            
+            # Run AI analysis if available
+            if AGENTS_AVAILABLE and hasattr(self, 'report_generator'):
+                print("🤖 Running AI financial analysis agents concurrently...")
+                
+                # Columnar view built once and shared with the agents that scan transactions
+                columns = build_transaction_columns(financial_data) if DATA_PROCESSOR_AVAILABLE else None
+                
+                extra_payment_amount = float(extra_payment) if extra_payment else 0
+                
+                partial_sections = {
+                    "🏦 Debt Analysis": "",
+                    "💰 Savings Strategy": "",
+                    "📋 Budget Analysis": "",
+                    "🎯 Payoff Plan": ""
+                }
+                progress_updated = asyncio.Event()
+                
+                def section_updater(name):
+                    def on_token(text):
+                        partial_sections[name] = text
+                        progress_updated.set()
+                    return on_token
+                
+                async def run_section(name, agent_call):
+                    # One failing agent should not sink the whole report
+                    try:
+                        result = await agent_call
+                    except Exception as e:
+                        result = f"⚠️ {name} unavailable: {e}"
+                    section_updater(name)(result)
+                    return result
                 
-                comprehensive_report = f"""
+                agents_task = asyncio.ensure_future(asyncio.gather(
+                    run_section("🏦 Debt Analysis", self._cached_agent_call_async(
+                        "debt", self.debt_analyzer.analyze_debt_async, financial_data,
+                        bypass_cache=force_refresh, data_digest=data_digest,
+                        on_token=section_updater("🏦 Debt Analysis"), columns=columns
+                    )),
+                    run_section("💰 Savings Strategy", self._cached_agent_call_async(
+                        "savings", self.savings_strategist.create_savings_plan_async, financial_data, financial_goals,
+                        bypass_cache=force_refresh, data_digest=data_digest,
+                        on_token=section_updater("💰 Savings Strategy")
+                    )),
+                    run_section("📋 Budget Analysis", self._cached_agent_call_async(
+                        "budget", self.budget_advisor.analyze_budget_async, financial_data,
+                        bypass_cache=force_refresh, data_digest=data_digest,
+                        on_token=section_updater("📋 Budget Analysis")
+                    )),
+                    run_section("🎯 Payoff Plan", self._cached_agent_call_async(
+                        "payoff", self.payoff_optimizer.create_payoff_plan_async, financial_data, extra_payment_amount,
+                        bypass_cache=force_refresh, data_digest=data_digest
+                    ))
+                ))
+                
+                try:
+                    # Emit the partial report every time an agent produces new text
+                    while not agents_task.done():
+                        update_waiter = asyncio.create_task(progress_updated.wait())
+                        await asyncio.wait({agents_task, update_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                        update_waiter.cancel()
+                        progress_updated.clear()
+                        if not agents_task.done():
+                            yield report_note + self._format_progress_report(partial_sections), None
+                finally:
+                    if not agents_task.done():
+                        agents_task.cancel()
+                
+                debt_analysis, savings_strategy, budget_advice, payoff_plan = agents_task.result()
+                
+                comprehensive_report = self.report_generator.generate_report(
+                    debt_analysis, savings_strategy, budget_advice, payoff_plan, financial_data
+                )
+            else:
+                comprehensive_report = self._create_fallback_report(financial_data)
+            
+            # Collect the dashboard rendered in the background
+            financial_dashboard = await dashboard_task
+            
+            yield report_note + comprehensive_report, financial_dashboard
+            
+        except Exception as e:
+            print(f"❌ Error during financial analysis: {e}")
+            yield self._create_error_response(e)
+    
+    async def analyze_finances_batched(self, file_upload, financial_goals, extra_payment, force_refresh=False):
+        """
+        📦 BATCHED FINANCIAL ANALYSIS
+        
+        WHAT THIS FUNCTION DOES:
+        Same result as analyze_finances_async(), but the debt, savings and budget
+        prompts go to the model as ONE request with a JSON reply (see
+        run_batched_ai_analysis in agents.py). One round trip and one shared
+        instruction header instead of three separate calls.
+        
+        If the AI model is unavailable, or the batched reply can't be used
+        (bad JSON, missing section, API error), falls back to the per-agent
+        fan-out so the user always gets a report.
+        """
+        if not (AGENTS_AVAILABLE and hasattr(self, 'report_generator') and self.debt_analyzer.ai_available):
+            return await self.analyze_finances_async(file_upload, financial_goals, extra_payment, force_refresh)
+        
+        print("📄 Starting financial analysis workflow (batched)...")
+        
+        try:
+            financial_data, report_note = await asyncio.to_thread(self._load_financial_data, file_upload)
+            data_digest = await asyncio.to_thread(financial_data_digest, financial_data)
+            
+            # The dashboard only needs financial_data, so render it while the model runs
+            dashboard_task = asyncio.create_task(asyncio.to_thread(self._create_dashboard, financial_data))
+            
+            columns = build_transaction_columns(financial_data) if DATA_PROCESSOR_AVAILABLE else None
+            extra_payment_amount = float(extra_payment) if extra_payment else 0
+            
+            try:
+                sections, payoff_plan = await asyncio.gather(
+                    run_batched_ai_analysis(
+                        self.debt_analyzer, self.savings_strategist, self.budget_advisor,
+                        financial_data, financial_goals, columns
+                    ),
+                    self._cached_agent_call_async(
+                        "payoff", self.payoff_optimizer.create_payoff_plan_async, financial_data, extra_payment_amount,
+                        bypass_cache=force_refresh, data_digest=data_digest
+                    )
+                )
+            except BaseException:
+                dashboard_task.cancel()
+                raise
+            
+            comprehensive_report = self.report_generator.generate_report(
+                sections['debt_analysis'], sections['savings_strategy'], sections['budget_analysis'],
+                payoff_plan, financial_data
+            )
+            
+            financial_dashboard = await dashboard_task
+            
+            return report_note + comprehensive_report, financial_dashboard
+            
+        except Exception as e:
+            print(f"⚠️ Batched analysis failed ({e}) - falling back to individual agent calls")
+            return await self.analyze_finances_async(file_upload, financial_goals, extra_payment, force_refresh)
+    
+    def _format_progress_report(self, sections):
+        """⏳ Markdown view of the agent sections while they are still being written"""
+        progress_parts = ["## ⏳ Building Your Financial Analysis...\n"]
+        for name, text in sections.items():
+            progress_parts.append(f"### {name}\n\n{text or '_Working on it..._'}\n")
+        return "\n".join(progress_parts)
+    
+    def _cached_agent_call(self, agent_name, agent_method, *inputs, bypass_cache=False, data_digest=None, **agent_options):
+        """⚡ Run an agent method through the result cache and router (agent_options are not part of the key)"""
+        key, fingerprint, cached = self._lookup_agent_result(agent_name, inputs, bypass_cache, data_digest)
+        if cached is not None:
+            return cached
+        
+        result = agent_method(*inputs, **agent_options)
+        self._remember_agent_result(key, fingerprint, result, inputs)
+        return result
+    
+    async def _cached_agent_call_async(self, agent_name, agent_method, *inputs, bypass_cache=False, data_digest=None,
+                                       **agent_options):
+        """⚡ Async version of _cached_agent_call (agent_options, e.g. on_token, are not part of the key)"""
+        # Key and fingerprint read financial_data - keep that off the event loop
+        key, fingerprint, cached = await asyncio.to_thread(
+            self._lookup_agent_result, agent_name, inputs, bypass_cache, data_digest
+        )
+        if cached is not None:
+            return cached
+        
+        result = await agent_method(*inputs, **agent_options)
+        self._remember_agent_result(key, fingerprint, result, inputs)
+        return result
+    
+    def _lookup_agent_result(self, agent_name, inputs, bypass_cache, data_digest=None):
+        """🔍 Exact cache first, then the router's near-identical profiles (pass the analysis' data_digest to skip re-hashing)"""
+        financial_data, *extra_inputs = inputs
+        key = agent_cache_key(agent_name, data_digest or financial_data_digest(financial_data), *extra_inputs)
+        router = getattr(self, 'router', None)
+        fingerprint = router.fingerprint(agent_name, *inputs) if router else None
+        
+        if bypass_cache:
+            return key, fingerprint, None
+        
+        cached = self._get_cached_result(key)
+        if cached is not None:
+            print(f"⚡ Using cached {agent_name} result")
+            return key, fingerprint, cached
+        
+        if fingerprint is not None:
+            routed = router.lookup(fingerprint, *inputs)
+            if routed is not None:
+                print(f"♻️ Router re-rendered {agent_name} answer from a near-identical profile")
+                return key, fingerprint, routed
+        
+        return key, fingerprint, None
+    
+    def _remember_agent_result(self, key, fingerprint, result, inputs):
+        """💾 Record a fresh agent result in the cache and router"""
+        self._store_cached_result(key, result)
+        if fingerprint is not None:
+            self.router.remember(fingerprint, result, *inputs)
+    
+    def _get_cached_result(self, key):
+        """🔍 Look up a cached agent result and mark it recently used"""
+        with _agent_cache_lock:
+            if key not in self.agent_cache:
+                return None
+            self.agent_cache.move_to_end(key)
+            return self.agent_cache[key]
+    
+    def _store_cached_result(self, key, result):
+        """💾 Store an agent result, evicting the least recently used entry when full"""
+        if not _is_cacheable_result(result):
+            return
+        
+        with _agent_cache_lock:
+            self.agent_cache[key] = result
+            self.agent_cache.move_to_end(key)
+            while len(self.agent_cache) > AGENT_CACHE_MAX_ENTRIES:
+                self.agent_cache.popitem(last=False)
+    
+    def process_document_cached(self, file_path):
+        """
+        📂 PARSE A DOCUMENT ONCE PER VERSION
+        
+        WHAT THIS FUNCTION DOES:
+        Returns the parsed financial data for file_path, reusing the previous
+        parse when the file's path, modification time and size are unchanged.
+        Changing only the goals or extra payment therefore costs no re-parse.
+        Error results are not cached, and every caller gets its own deep copy
+        (transactions and categories included), so nothing a caller changes can
+        reach the cached parse.
+        """
+        try:
+            stat = os.stat(file_path)
+            cache_key = (file_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return self.data_processor.process_document(file_path)
+        
+        with self._doc_cache_lock:
+            if cache_key in self._doc_cache:
+                self._doc_cache.move_to_end(cache_key)
+                print(f"⚡ Using cached parse of {os.path.basename(file_path)}")
+                return copy_plain_data(self._doc_cache[cache_key])
+        
+        financial_data = self.data_processor.process_document(file_path)
+        
+        if "error" not in financial_data:
+            with self._doc_cache_lock:
+                self._doc_cache[cache_key] = financial_data
+                while len(self._doc_cache) > DOCUMENT_CACHE_MAX_ENTRIES:
+                    self._doc_cache.popitem(last=False)
+        
+        return copy_plain_data(financial_data)
+    
+    def _load_financial_data(self, file_upload):
+        """📤 Load uploaded document (or sample data) and return it with a report note"""
+        if file_upload is not None and DATA_PROCESSOR_AVAILABLE:
+            print(f"📤 Processing uploaded file: {file_upload.name}")
+            financial_data = self.process_document_cached(file_upload.name)
+            if "error" in financial_data:
+                financial_data = create_sample_data()
+                report_note = "⚠️ Using sample data due to file processing error. "
+            else:
+                report_note = "✅ Successfully processed your financial document. "
+        else:
+            if DATA_PROCESSOR_AVAILABLE:
+                financial_data = create_sample_data()
+            else:
+                # Fallback sample data
+                financial_data = {
+                    'total_income': 5000,
+                    'total_expenses': 3500,
+                    'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300, 'Utilities': 200}
+                }
+            report_note = "📊 Using sample financial data for demonstration. "
+        
+        return financial_data, report_note
+    
+    def _create_fallback_report(self, financial_data):
+        """📊 Basic summary report when the AI agents are not available"""
+        print("📊 Generating fallback financial analysis...")
+        income = financial_data.get('total_income', 0)
+        expenses = financial_data.get('total_expenses', 0)
+        net_savings = income - expenses
+        savings_rate = (net_savings / income * 100) if income > 0 else 0
+        
+        return f"""
                 ## 📊 Financial Analysis Summary
                 
                 **Monthly Overview:**
@@ -251,47 +723,38 @@ class AIFinancialCoach:
                 
                 💡 **Note:** Full AI analysis requires OpenAI API key setup.
                 """
-            
-            # Create dashboard
-            if VISUALIZER_AVAILABLE and hasattr(self, 'visualizer'):
-                financial_dashboard = self.visualizer.create_financial_dashboard(financial_data)
-            else:
-                financial_dashboard = """
-                <div style="text-align: center; padding: 50px; background: #f8f9fa; border-radius: 10px;">
-                    <h3>📊 Dashboard</h3>
-                    <p>Interactive dashboard requires full setup completion.</p>
-                </div>
-                """
-            
-            return report_note + comprehensive_report, financial_dashboard
-            
-        except Exception as e:
-            print(f"❌ Error during financial analysis: {e}")
-            
-            error_message = f"""
-            ❌ **Error Processing Your Financial Analysis**
-            
-            **What happened:** {str(e)}
-            
-            **Possible causes:**
-            - Missing OpenAI API key
-            - Missing required modules
-            - File format issues
-            
-            **Solutions:**
-            1. Set OPENAI_API_KEY environment variable
-            2. Check all required files are present
-            3. Try with sample data (no file upload)
-            """
-            
-            error_dashboard = """
-            <div style="text-align: center; padding: 50px; background: #f8f9fa; border-radius: 10px;">
-                <h2 style="color: #dc3545;">📊 Dashboard Temporarily Unavailable</h2>
-                <p>Please resolve the error above to access dashboard.</p>
-            </div>
-            """
-            
-            return error_message, error_dashboard
+    
+    def _create_dashboard(self, financial_data):
+        """📈 Build the HTML dashboard (or a placeholder when the visualizer is missing)"""
+        if VISUALIZER_AVAILABLE and hasattr(self, 'visualizer'):
+            return self.visualizer.create_financial_dashboard(financial_data)
+        
+        return _DASHBOARD_PLACEHOLDER_HTML
+    
+    def _create_error_response(self, e):
+        """❌ Error report and dashboard pair for a failed analysis"""
+        return _ERROR_REPORT_TEMPLATE.format(error=str(e)), _ERROR_DASHBOARD_HTML
+
+_coach_instance = None
+_coach_lock = threading.Lock()
+
+def get_coach():
+    """
+    🤝 SHARED COACH INSTANCE
+    
+    WHAT THIS FUNCTION DOES:
+    Builds the AIFinancialCoach (and its five agents) once and hands the same
+    instance to every Gradio request, instead of rebuilding it on each click.
+    The agents keep no per-request state, so sharing them is safe.
+    """
+    global _coach_instance
+    
+    if _coach_instance is None:
+        with _coach_lock:
+            if _coach_instance is None:
+                _coach_instance = AIFinancialCoach()
+    
+    return _coach_instance
 
 # ============================================================================
 # FILE VALIDATION HELPER FUNCTIONS
@@ -456,11 +919,39 @@ def validate_uploaded_file(file_upload):
 # HELPER FUNCTIONS FOR PLOTS
 # ============================================================================
 
-def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
-    """Enhanced analysis function with proper file validation"""
+async def _batched_analysis_updates(coach, file_upload, financial_goals, extra_payment, force_refresh=False):
+    """📦 Batched analysis as a one-update stream (same shape as stream_finances_async)"""
+    yield await coach.analyze_finances_batched(file_upload, financial_goals, extra_payment, force_refresh)
+
+def _build_summary_outputs(coach, file_upload, file_status):
+    """📊 Expense figure, cash flow figure and metrics HTML for the request's data (blocking - run in a thread)"""
+    # Get financial data for creating plots
+    if file_upload is not None and DATA_PROCESSOR_AVAILABLE and file_status == "valid":
+        financial_data = coach.process_document_cached(file_upload.name)
+        if "error" in financial_data:
+            financial_data = create_sample_data() if DATA_PROCESSOR_AVAILABLE else {
+                'total_income': 5000, 'total_expenses': 3500,
+                'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300}
+            }
+    else:
+        financial_data = create_sample_data() if DATA_PROCESSOR_AVAILABLE else {
+            'total_income': 5000, 'total_expenses': 3500,
+            'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300}
+        }
+    
+    return create_expense_plot(financial_data), create_cashflow_plot(financial_data), create_metrics_summary(financial_data)
+
+async def analyze_finances_with_plots(file_upload, financial_goals, extra_payment, force_refresh=False):
+    """
+    Enhanced analysis function with proper file validation (async generator - Gradio streams each yield)
+    
+    Everything that blocks - file checks, parsing, coach construction, Plotly
+    figures - runs in a worker thread via asyncio.to_thread, so one upload
+    never stalls the event loop that serves every other Gradio session.
+    """
     try:
         # First validate the uploaded file
-        file_status, filename, message = validate_uploaded_file(file_upload)
+        file_status, filename, message = await asyncio.to_thread(validate_uploaded_file, file_upload)
         
         print(f"File validation result: {file_status} - {message}")
         
@@ -480,7 +971,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             **To see sample analysis:** Remove the file and click "Analyze My Finances" again.
             """
             
-            empty_fig = create_empty_file_plot()
+            empty_fig = await asyncio.to_thread(create_empty_file_plot)
             error_html = """
             <div style="background: #fff3cd; border: 1px solid #ffeaa7; padding: 20px; border-radius: 8px; margin: 10px 0;">
                 <h3 style="color: #856404; margin: 0 0 10px 0;">📁 Empty File</h3>
@@ -488,7 +979,9 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             </div>
             """
             
-            return error_report, empty_fig, empty_fig, error_html
+            yield error_report, empty_fig, empty_fig, error_html
+            
+            return
         
         elif file_status == "too_small":
             error_report = f"""
@@ -509,7 +1002,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             **To see sample analysis:** Remove the file and click "Analyze My Finances" again.
             """
             
-            small_fig = create_small_file_plot()
+            small_fig = await asyncio.to_thread(create_small_file_plot)
             error_html = """
             <div style="background: #fff3cd; border: 1px solid #ffeaa7; padding: 20px; border-radius: 8px; margin: 10px 0;">
                 <h3 style="color: #856404; margin: 0 0 10px 0;">📏 File Too Small</h3>
@@ -517,7 +1010,9 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             </div>
             """
             
-            return error_report, small_fig, small_fig, error_html
+            yield error_report, small_fig, small_fig, error_html
+            
+            return
         
         elif file_status == "no_content":
             error_report = f"""
@@ -546,7 +1041,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             **To see sample analysis:** Remove the file and click "Analyze My Finances" again.
             """
             
-            no_data_fig = create_no_data_plot()
+            no_data_fig = await asyncio.to_thread(create_no_data_plot)
             error_html = """
             <div style="background: #e2e3e5; border: 1px solid #d6d8db; padding: 20px; border-radius: 8px; margin: 10px 0;">
                 <h3 style="color: #383d41; margin: 0 0 10px 0;">📋 No Data</h3>
@@ -554,7 +1049,9 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             </div>
             """
             
-            return error_report, no_data_fig, no_data_fig, error_html
+            yield error_report, no_data_fig, no_data_fig, error_html
+            
+            return
         
         elif file_status in ["file_not_found", "size_error", "content_error", "excel_error"]:
             error_report = f"""
@@ -573,7 +1070,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             **To see sample analysis:** Remove the file and click "Analyze My Finances" again.
             """
             
-            error_fig = create_error_plot(f"File error: {message}")
+            error_fig = await asyncio.to_thread(create_error_plot, f"File error: {message}")
             error_html = f"""
             <div style="background: #f8d7da; border: 1px solid #f5c6cb; padding: 20px; border-radius: 8px; margin: 10px 0;">
                 <h3 style="color: #721c24; margin: 0 0 10px 0;">💢 Processing Error</h3>
@@ -581,10 +1078,12 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             </div>
             """
             
-            return error_report, error_fig, error_fig, error_html
+            yield error_report, error_fig, error_fig, error_html
+            
+            return
         
         # If we reach here, file is valid or no file uploaded
-        coach = AIFinancialCoach()
+        coach = await asyncio.to_thread(get_coach)
         
         if file_status == "valid":
             # File is valid, try to process it and validate content
@@ -592,11 +1091,13 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             
             # Process the file and check if it contains actual financial data
             if DATA_PROCESSOR_AVAILABLE:
-                financial_data = coach.data_processor.process_document(file_upload.name)
+                financial_data = await asyncio.to_thread(coach.process_document_cached, file_upload.name)
                 
                 if "error" not in financial_data:
                     # NEW: Validate that this is actually financial content
-                    is_financial, validation_message = validate_financial_content(financial_data, file_upload.name)
+                    is_financial, validation_message = await asyncio.to_thread(
+                        validate_financial_content, financial_data, file_upload.name
+                    )
                     
                     if not is_financial:
                         error_report = f"""
@@ -621,7 +1122,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
                         **Sample Analysis:** Remove the file and click "Analyze" to see how financial analysis works with sample data.
                         """
                         
-                        non_financial_fig = create_non_financial_plot()
+                        non_financial_fig = await asyncio.to_thread(create_non_financial_plot)
                         error_html = """
                         <div style="background: #e3f2fd; border: 1px solid #90caf9; padding: 20px; border-radius: 8px; margin: 10px 0;">
                             <h3 style="color: #1565c0; margin: 0 0 10px 0;">📄 Non-Financial Content</h3>
@@ -629,7 +1130,9 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
                         </div>
                         """
                         
-                        return error_report, non_financial_fig, non_financial_fig, error_html
+                        yield error_report, non_financial_fig, non_financial_fig, error_html
+                        
+                        return
             
             file_success_note = f"✅ **File validation passed:** `{filename}` - Processing financial data...\n\n"
         else:
@@ -637,36 +1140,24 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
             print("No file uploaded, using sample data")
             file_success_note = "📊 **Sample Data Analysis** - No file uploaded, using demonstration data.\n\n"
         
-        # Continue with normal analysis
-        report, _ = coach.analyze_finances(file_upload, financial_goals, extra_payment)
-        
-        # Add file processing note at the beginning (but remove the old one if it exists)
-        if report.startswith("⚠️ Using sample data due to file processing error."):
-            # Remove the old error message since we handled validation properly
-            report = report.replace("⚠️ Using sample data due to file processing error. ", "")
-        
-        report = file_success_note + report
+        # Create charts first - they are fast, so the user sees them right away
+        expense_fig, cashflow_fig, metrics_html = await asyncio.to_thread(
+            _build_summary_outputs, coach, file_upload, file_status
+        )
         
-        # Get financial data for creating plots
-        if file_upload is not None and DATA_PROCESSOR_AVAILABLE and file_status == "valid":
-            financial_data = coach.data_processor.process_document(file_upload.name)
-            if "error" in financial_data:
-                financial_data = create_sample_data() if DATA_PROCESSOR_AVAILABLE else {
-                    'total_income': 5000, 'total_expenses': 3500,
-                    'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300}
-                }
+        # Continue with normal analysis, streaming the report as the agents write it
+        if BATCH_AGENT_CALLS:
+            analysis_updates = _batched_analysis_updates(coach, file_upload, financial_goals, extra_payment, force_refresh)
         else:
-            financial_data = create_sample_data() if DATA_PROCESSOR_AVAILABLE else {
-                'total_income': 5000, 'total_expenses': 3500,
-                'categories': {'Rent': 1200, 'Food': 400, 'Transport': 300}
-            }
+            analysis_updates = coach.stream_finances_async(file_upload, financial_goals, extra_payment, force_refresh)
         
-        # Create charts
-        expense_fig = create_expense_plot(financial_data)
-        cashflow_fig = create_cashflow_plot(financial_data)
-        metrics_html = create_metrics_summary(financial_data)
-        
-        return report, expense_fig, cashflow_fig, metrics_html
+        async for report, _ in analysis_updates:
+            # Add file processing note at the beginning (but remove the old one if it exists)
+            if report.startswith("⚠️ Using sample data due to file processing error."):
+                # Remove the old error message since we handled validation properly
+                report = report.replace("⚠️ Using sample data due to file processing error. ", "")
+            
+            yield file_success_note + report, expense_fig, cashflow_fig, metrics_html
         
     except Exception as e:
         print(f"Error in enhanced analysis: {e}")
@@ -685,7 +1176,7 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
         4. Contact support if the problem persists
         """
         
-        error_fig = create_error_plot(str(e))
+        error_fig = await asyncio.to_thread(create_error_plot, str(e))
         error_html = f"""
         <div style="background: #f8d7da; border: 1px solid #f5c6cb; padding: 20px; border-radius: 8px; margin: 10px 0;">
             <h3 style="color: #721c24; margin: 0 0 10px 0;">💥 System Error</h3>
@@ -693,7 +1184,12 @@ def analyze_finances_with_plots(file_upload, financial_goals, extra_payment):
         </div>
         """
         
-        return general_error_report, error_fig, error_fig, error_html
+        yield general_error_report, error_fig, error_fig, error_html
+        
+        return
+
+# Lower-cased category names treated as income (left out of the expense chart)
+INCOME_CATEGORY_NAMES = frozenset({'salary', 'income', 'deposit', 'bonus', 'refund'})
 
 def create_expense_plot(financial_data):
     """Create expense pie chart"""
@@ -703,7 +1199,7 @@ def create_expense_plot(financial_data):
         categories = financial_data.get('categories', {})
         expense_categories = {
             category: amount for category, amount in categories.items() 
-            if category.lower() not in ['salary', 'income', 'deposit', 'bonus', 'refund']
+            if category.lower() not in INCOME_CATEGORY_NAMES
         }
         
         if not expense_categories:
@@ -876,8 +1372,10 @@ def create_gradio_interface():
     """Create the Gradio web interface"""
     print("🎨 Creating Gradio web interface...")
     
-    # Initialize our FinWise AI
-    coach = AIFinancialCoach()
+    gr = _gr()
+    
+    # Initialize our FinWise AI once - requests reuse this shared instance
+    coach = get_coach()
     
     with gr.Blocks(
         theme=gr.themes.Soft(),
@@ -955,6 +1453,11 @@ def create_gradio_interface():
                     value=0,
                     minimum=0
                 )
+                
+                force_refresh = gr.Checkbox(
+                    label="🔄 Force refresh (ignore cached AI results)",
+                    value=False
+                )
         
         # Analysis button
         analyze_button = gr.Button(
@@ -998,7 +1501,7 @@ def create_gradio_interface():
         # Connect button to analysis function
         analyze_button.click(
             fn=analyze_finances_with_plots,
-            inputs=[file_upload, financial_goals, extra_payment],
+            inputs=[file_upload, financial_goals, extra_payment, force_refresh],
             outputs=[financial_report, expense_chart, cashflow_chart, metrics_summary],
             show_progress=True
         )
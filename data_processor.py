@@ -6,7 +6,7 @@
 # various document formats and extract meaningful financial information.
 # 
 # ENHANCED FEATURES:
-# 🔧 Automatic dependency checking and installation for document processing
+# 🔧 Fast dependency checking (installation is opt-in via --install-deps)
 # 📄 Support for multiple file formats (CSV, Excel, PDF, Word documents)
 # 🚨 Intelligent error handling with helpful recovery suggestions
 # 📊 Smart data validation and cleaning
@@ -30,28 +30,71 @@
 # ============================================================================
 
 import sys
-import subprocess
 import importlib.util
 import os
 import json
-from typing import Dict, List, Any, Optional
+import codecs
+import logging
+import mmap
+from collections import defaultdict
+from contextlib import nullcontext
+from functools import cache, lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
 
+# Public API - the lazily imported libraries (pd, np, PyPDF2, Document, openpyxl)
+# stay reachable as attributes but are never dragged in by "from data_processor import *"
+__all__ = [
+    'FinancialDataProcessor',
+    'create_sample_data',
+    'copy_plain_data',
+    'build_transaction_columns',
+    'check_document_processing_dependencies',
+    'ensure_document_dependencies',
+    'freeze_document_capabilities',
+    'DOCUMENT_CAPABILITIES',
+    'PANDAS_AVAILABLE',
+    'EXCEL_AVAILABLE',
+    'PDF_AVAILABLE',
+    'DOCX_AVAILABLE'
+]
+
 # ============================================================================
 # SMART DEPENDENCY MANAGEMENT - Document Processing Prerequisites
 # ============================================================================
 
+# Capability report goes to logging (DEBUG), not stdout - enable with logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+# Status markers for start-up output: emoji only when stdout can encode them
+# (an ASCII-only stdout, e.g. PYTHONIOENCODING=ascii, would raise UnicodeEncodeError)
+EMOJI_OUTPUT = 'utf' in (getattr(sys.stdout, 'encoding', None) or '').lower()
+_OK, _ERR, _WARN, _INFO = ("✅", "❌", "⚠️", "📊") if EMOJI_OUTPUT else ("[ok]", "[err]", "[warn]", "[info]")
+
+# (import name, capability flags it enables, pip package, what it covers)
+DOCUMENT_LIBRARIES = (
+    ('pandas', ('csv_processing', 'data_analysis'), 'pandas', "CSV and data analysis"),
+    ('openpyxl', ('excel_processing',), 'openpyxl', "Excel processing"),
+    ('PyPDF2', ('pdf_processing',), 'PyPDF2', "PDF processing"),
+    ('docx', ('word_processing',), 'python-docx', "Word document processing")
+)
+
+@cache
 def check_document_processing_dependencies():
     """
     📄 DOCUMENT PROCESSING DEPENDENCY CHECKER
     
     WHAT THIS FUNCTION DOES:
     1. Checks if document processing packages are available
-    2. Attempts to install missing packages automatically
-    3. Provides capability flags for different file formats
-    4. Returns comprehensive capability assessment
+    2. Provides capability flags for different file formats
+    3. Returns comprehensive capability assessment
+    
+    Nothing is installed here. Missing packages just disable their formats;
+    run ensure_document_dependencies() (or "python data_processor.py
+    --install-deps") to install them. The result is cached, so the check and
+    its report run once per process.
     
     DOCUMENT PROCESSING PACKAGES NEEDED:
     - pandas: Core data manipulation (CSV, Excel)
@@ -64,7 +107,7 @@ def check_document_processing_dependencies():
     Dictionary with capability flags for different document types
     """
     
-    print("📄 Checking document processing dependencies...")
+    log.debug("Checking document processing dependencies")
     
     capabilities = {
         'csv_processing': False,
@@ -75,118 +118,156 @@ def check_document_processing_dependencies():
         'full_document_support': False
     }
     
-    # Check Pandas (core data processing)
-    try:
-        import pandas as pd
-        capabilities['csv_processing'] = True
-        capabilities['data_analysis'] = True
-        print("✅ Pandas - CSV and data analysis available")
-    except ImportError:
-        print("❌ Pandas missing - trying to install...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas"])
-            import pandas as pd
-            capabilities['csv_processing'] = True
-            capabilities['data_analysis'] = True
-            print("✅ Pandas installed successfully!")
-        except Exception as e:
-            print(f"⚠️ Pandas installation failed: {e}")
+    for module_name, capability_flags, _, description in DOCUMENT_LIBRARIES:
+        available = _package_available(module_name)
+        for flag in capability_flags:
+            capabilities[flag] = available
+        if available:
+            log.debug("%s available: %s", module_name, description)
+        else:
+            log.warning("%s missing: %s disabled", module_name, description)
     
-    # Check OpenPyXL (Excel processing)
-    try:
-        import openpyxl
-        capabilities['excel_processing'] = True
-        print("✅ OpenPyXL - Excel processing available")
-    except ImportError:
-        print("❌ OpenPyXL missing - trying to install...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "openpyxl"])
-            capabilities['excel_processing'] = True
-            print("✅ OpenPyXL installed successfully!")
-        except Exception as e:
-            print(f"⚠️ OpenPyXL installation failed: {e}")
+    # Determine full capability
+    capabilities['full_document_support'] = (
+        capabilities['csv_processing']
+        and capabilities['excel_processing']
+        and capabilities['pdf_processing']
+    )
     
-    # Check PyPDF2 (PDF processing)
-    try:
-        import PyPDF2
-        capabilities['pdf_processing'] = True
-        print("✅ PyPDF2 - PDF processing available")
-    except ImportError:
-        print("❌ PyPDF2 missing - trying to install...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "PyPDF2"])
-            capabilities['pdf_processing'] = True
-            print("✅ PyPDF2 installed successfully!")
-        except Exception as e:
-            print(f"⚠️ PyPDF2 installation failed: {e}")
+    log.debug("Document capabilities: %s", capabilities)
     
-    # Check python-docx (Word processing)
-    try:
-        import docx
-        capabilities['word_processing'] = True
-        print("✅ python-docx - Word document processing available")
-    except ImportError:
-        print("❌ python-docx missing - trying to install...")
+    return capabilities
+
+# Every optional module this file probes for
+PROBED_MODULES = ('pandas', 'numpy', 'pyarrow', 'openpyxl', 'PyPDF2', 'docx', 'ahocorasick')
+
+# Availability frozen at image build time (python data_processor.py --freeze-capabilities);
+# when present, no probing happens at start-up
+try:
+    from _document_capabilities import PACKAGE_AVAILABILITY as FROZEN_PACKAGE_AVAILABILITY
+except ImportError:
+    FROZEN_PACKAGE_AVAILABILITY = {}
+
+def _package_available(module_name: str) -> bool:
+    """🔍 True if a module can be imported (already loaded, frozen answer, else find_spec - nothing is executed)"""
+    if module_name in sys.modules:
+        return True
+    frozen = FROZEN_PACKAGE_AVAILABILITY.get(module_name)
+    if frozen is not None:
+        return frozen
+    return importlib.util.find_spec(module_name) is not None
+
+def freeze_document_capabilities(path: Optional[str] = None) -> str:
+    """
+    🧊 FREEZE CAPABILITY DETECTION FOR CONTAINER IMAGES
+    
+    WHAT THIS FUNCTION DOES:
+    Probes every optional module once and writes the answers to
+    _document_capabilities.py next to this file. In an image whose packages
+    are fixed at build time, run "python data_processor.py
+    --freeze-capabilities" after pip install; every cold start then reads
+    the literal dict instead of probing. Regenerate (or delete the file)
+    whenever packages change.
+    """
+    
+    path = path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "_document_capabilities.py")
+    availability = {name: importlib.util.find_spec(name) is not None for name in PROBED_MODULES}
+    
+    with open(path, 'w', encoding='utf-8') as capabilities_file:
+        capabilities_file.write("# Generated by: python data_processor.py --freeze-capabilities\n")
+        capabilities_file.write("# Regenerate after installing or removing packages.\n")
+        capabilities_file.write(f"PACKAGE_AVAILABILITY = {availability!r}\n")
+    
+    print(f"{_OK} Document capabilities frozen to {path}")
+    return path
+
+def ensure_document_dependencies() -> Dict[str, bool]:
+    """
+    📦 INSTALL MISSING DOCUMENT PROCESSING PACKAGES
+    
+    WHAT THIS FUNCTION DOES:
+    pip-installs any document library that is missing, then re-runs the
+    capability check. Never called on import - run it explicitly, e.g.
+    "python data_processor.py --install-deps". Restart the app afterwards so
+    the module-level capability flags pick up the new packages.
+    """
+    
+    # Probe directly - a frozen capabilities file may be out of date
+    missing = [
+        package_name for module_name, _, package_name, _ in DOCUMENT_LIBRARIES
+        if importlib.util.find_spec(module_name) is None
+    ]
+    
+    if missing:
+        # Only the install path needs subprocess (and its selectors/signal imports)
+        import subprocess
+        
+        # One pip run for everything - pip's own start-up and resolver are paid once
+        print(f"{_INFO} Installing {', '.join(missing)}...")
         try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "python-docx"])
-            capabilities['word_processing'] = True
-            print("✅ python-docx installed successfully!")
+            subprocess.check_call([
+                sys.executable, "-m", "pip", "install",
+                "--disable-pip-version-check", "--no-input", *missing
+            ])
+            print(f"{_OK} Packages installed successfully!")
         except Exception as e:
-            print(f"⚠️ python-docx installation failed: {e}")
+            print(f"{_WARN} Package installation failed: {e}")
     
-    # Determine full capability
-    capabilities['full_document_support'] = all([
-        capabilities['csv_processing'],
-        capabilities['excel_processing'],
-        capabilities['pdf_processing']
-    ])
-    
-    if capabilities['full_document_support']:
-        print("🎉 Full document processing capabilities available!")
-    else:
-        print("💡 Partial document processing capabilities - some formats may be limited")
+    importlib.invalidate_caches()
+    check_document_processing_dependencies.cache_clear()
+    return check_document_processing_dependencies()
+
+# Module attributes that are imported on first use: name -> module or (module, attribute)
+_LAZY_IMPORTS = {
+    'pd': 'pandas',
+    'np': 'numpy',
+    'PyPDF2': 'PyPDF2',
+    'Document': ('docx', 'Document'),
+    'openpyxl': 'openpyxl',
+    'ahocorasick': 'ahocorasick'
+}
+
+def _lazy_import(name: str):
+    """📦 Import a _LAZY_IMPORTS entry and bind it as a module global (later lookups are plain globals)"""
+    module_globals = globals()
+    if name in module_globals:
+        return module_globals[name]
     
-    return capabilities
+    target = _LAZY_IMPORTS[name]
+    if isinstance(target, str):
+        value = importlib.import_module(target)
+    else:
+        value = getattr(importlib.import_module(target[0]), target[1])
+    module_globals[name] = value
+    return value
 
-# Initialize capabilities
-DOCUMENT_CAPABILITIES = check_document_processing_dependencies()
+def __getattr__(name):
+    """⏳ Lazy module attributes (PEP 562): document libraries and DOCUMENT_CAPABILITIES"""
+    if name in _LAZY_IMPORTS:
+        return _lazy_import(name)
+    if name == 'DOCUMENT_CAPABILITIES':
+        return check_document_processing_dependencies()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Smart imports based on availability
-if DOCUMENT_CAPABILITIES['data_analysis']:
-    try:
-        import pandas as pd
-        PANDAS_AVAILABLE = True
-    except ImportError:
-        PANDAS_AVAILABLE = False
-else:
-    PANDAS_AVAILABLE = False
+# Availability flags only - the heavy libraries are imported by the code that
+# parses a file, so importing this module (or processing sample data) never pays
+# for pandas, openpyxl, PyPDF2 or python-docx start-up
+PANDAS_AVAILABLE = _package_available("pandas") and _package_available("numpy")
 
-if DOCUMENT_CAPABILITIES['pdf_processing']:
-    try:
-        import PyPDF2
-        PDF_AVAILABLE = True
-    except ImportError:
-        PDF_AVAILABLE = False
-else:
-    PDF_AVAILABLE = False
+# Optional multithreaded CSV parser for pandas (standard C engine otherwise)
+PYARROW_AVAILABLE = PANDAS_AVAILABLE and _package_available("pyarrow")
 
-if DOCUMENT_CAPABILITIES['word_processing']:
-    try:
-        from docx import Document
-        DOCX_AVAILABLE = True
-    except ImportError:
-        DOCX_AVAILABLE = False
-else:
-    DOCX_AVAILABLE = False
+# Optional Aho-Corasick keyword automaton (pyahocorasick) for categorization (compiled regex otherwise)
+AHOCORASICK_AVAILABLE = _package_available("ahocorasick")
 
-if DOCUMENT_CAPABILITIES['excel_processing']:
-    try:
-        import openpyxl
-        EXCEL_AVAILABLE = True
-    except ImportError:
-        EXCEL_AVAILABLE = False
-else:
-    EXCEL_AVAILABLE = False
+PDF_AVAILABLE = _package_available("PyPDF2")
+DOCX_AVAILABLE = _package_available("docx")
+EXCEL_AVAILABLE = _package_available("openpyxl")
+
+@cache
+def _load_pandas():
+    """🐼 (pandas, numpy), imported on first use - code that needs them binds them locally: pd, np = _load_pandas()"""
+    return _lazy_import('pd'), _lazy_import('np')
 
 # ============================================================================
 # MAIN FINANCIAL DATA PROCESSOR CLASS - Enhanced with Smart Capabilities
@@ -226,6 +307,90 @@ class FinancialDataProcessor:
     6. Returns structured data ready for AI analysis
     """
     
+    # Regexes compiled once for the whole class (used per row / per document)
+    AMOUNT_CLEAN_RE = re.compile(r'[\$,\s]')
+    PDF_AMOUNT_RE = re.compile(r'\$[\d,]+\.?\d*')
+    TEXT_AMOUNT_RE = re.compile(r'\$?[\d,]+\.?\d*')
+    # Characters dropped from a matched amount before float() (one translate pass, built once)
+    AMOUNT_STRIP_TABLE = str.maketrans('', '', ',$ ')
+    
+    DATE_RES = (
+        re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
+        re.compile(r'\d{1,2}-\d{1,2}-\d{4}'),
+        re.compile(r'\d{4}-\d{1,2}-\d{1,2}')
+    )
+    
+    # Fixed date layouts tried for whole date columns - only ones where strptime
+    # reads a date exactly as _clean_date's per-value parse does (month first)
+    DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%Y/%m/%d', '%m-%d-%Y', '%Y-%m-%d %H:%M:%S')
+    
+    # Column patterns for intelligent matching (standard name -> header patterns)
+    COLUMN_PATTERNS = {
+        'date': ['date', 'transaction_date', 'posting_date', 'trans_date', 'dt', 'timestamp'],
+        'amount': ['amount', 'transaction_amount', 'debit', 'credit', 'value', 'sum', 'total', 'amt'],
+        'description': ['description', 'memo', 'details', 'transaction_details', 'desc', 'note'],
+        'category': ['category', 'type', 'transaction_type', 'class', 'classification', 'cat']
+    }
+    
+    # Reverse index: a header that IS a pattern gets that standard name's best possible score
+    COLUMN_PATTERN_INDEX = {
+        pattern: standard_name for standard_name, patterns in COLUMN_PATTERNS.items() for pattern in patterns
+    }
+    
+    # Header rows of common bank/app exports -> the mapping _detect_csv_columns would
+    # choose for them; a match skips scoring and only the mapped columns are parsed
+    KNOWN_CSV_SCHEMAS = {
+        # Chase credit card
+        ('Transaction Date', 'Post Date', 'Description', 'Category', 'Type', 'Amount', 'Memo'):
+            {'date': 'Transaction Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category'},
+        # Chase checking
+        ('Details', 'Posting Date', 'Description', 'Amount', 'Type', 'Balance', 'Check or Slip #'):
+            {'date': 'Posting Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Type'},
+        # American Express
+        ('Date', 'Description', 'Amount'):
+            {'date': 'Date', 'amount': 'Amount', 'description': 'Description'},
+        ('Date', 'Description', 'Card Member', 'Account #', 'Amount'):
+            {'date': 'Date', 'amount': 'Amount', 'description': 'Description'},
+        # Mint
+        ('Date', 'Description', 'Original Description', 'Amount', 'Transaction Type', 'Category',
+         'Account Name', 'Labels', 'Notes'):
+            {'date': 'Date', 'amount': 'Amount', 'description': 'Description', 'category': 'Category'},
+        # Bank of America
+        ('Posted Date', 'Reference Number', 'Payee', 'Address', 'Amount'):
+            {'date': 'Posted Date', 'amount': 'Amount'}
+    }
+    
+    # CSVs at least this big are parsed with pyarrow.csv directly (see _read_csv_fast)
+    ARROW_DIRECT_MIN_BYTES = 32 * 1024 * 1024
+    
+    # CSVs at least this big are streamed CSV_CHUNK_ROWS rows at a time (see _process_csv_chunked)
+    CSV_CHUNK_MIN_BYTES = 256 * 1024 * 1024
+    CSV_CHUNK_ROWS = 100_000
+    
+    # Data-quality problems found while extracting transactions (kind -> message);
+    # each is reported once with its row count and the first few row numbers
+    DATA_QUALITY_MESSAGES = {
+        'amount': "amount missing or not a number - row skipped",
+        'date': "date missing or unreadable - kept as written"
+    }
+    DATA_QUALITY_SAMPLE_ROWS = 5
+    
+    # Text files are scanned this many characters at a time (see _scan_text_file)
+    TEXT_CHUNK_CHARS = 1024 * 1024
+    
+    # Transaction categorization keywords (priority order - first matching category wins)
+    CATEGORY_KEYWORDS = {
+        'Housing': ['rent', 'mortgage', 'property tax', 'hoa', 'utilities', 'electric', 'gas', 'water', 'internet', 'cable'],
+        'Transportation': ['gas', 'fuel', 'uber', 'lyft', 'taxi', 'bus', 'train', 'car payment', 'auto insurance', 'parking'],
+        'Food': ['grocery', 'restaurant', 'food', 'dining', 'coffee', 'lunch', 'dinner', 'breakfast', 'fast food'],
+        'Healthcare': ['medical', 'doctor', 'hospital', 'pharmacy', 'health insurance', 'dental', 'vision'],
+        'Entertainment': ['movie', 'netflix', 'spotify', 'gaming', 'concert', 'theater', 'streaming'],
+        'Shopping': ['amazon', 'target', 'walmart', 'mall', 'store', 'clothing', 'electronics'],
+        'Debt Payment': ['credit card', 'loan payment', 'student loan', 'debt', 'financing'],
+        'Income': ['salary', 'paycheck', 'bonus', 'refund', 'deposit', 'income', 'wages'],
+        'Savings': ['savings', 'investment', 'retirement', '401k', 'ira', 'emergency fund']
+    }
+    
     def __init__(self):
         """
         ENHANCED INITIALIZATION: Set up processor with smart capabilities
@@ -237,51 +402,116 @@ class FinancialDataProcessor:
         4. Configures error handling strategies
         """
         
-        print("📊 Initializing Financial Data Processor...")
+        print(f"{_INFO} Initializing Financial Data Processor...")
         
         # Set up supported formats based on available libraries
         self.supported_formats = []
         
+        # Plain text is parsed with the standard library - always available
+        self.supported_formats.append('.txt')
+        
         if PANDAS_AVAILABLE:
-            self.supported_formats.extend(['.csv', '.txt'])
-            print("✅ CSV and text file processing enabled")
+            self.supported_formats.append('.csv')
+            print(f"{_OK} CSV and text file processing enabled")
         
         if EXCEL_AVAILABLE and PANDAS_AVAILABLE:
             self.supported_formats.extend(['.xlsx', '.xls'])
-            print("✅ Excel file processing enabled")
+            print(f"{_OK} Excel file processing enabled")
         
         if PDF_AVAILABLE:
             self.supported_formats.append('.pdf')
-            print("✅ PDF file processing enabled")
+            print(f"{_OK} PDF file processing enabled")
         
         if DOCX_AVAILABLE:
             self.supported_formats.append('.docx')
-            print("✅ Word document processing enabled")
-        
-        if not self.supported_formats:
-            print("⚠️ Limited file processing - only sample data available")
-        
-        # Transaction categorization keywords
-        self.category_keywords = {
-            'Housing': ['rent', 'mortgage', 'property tax', 'hoa', 'utilities', 'electric', 'gas', 'water', 'internet', 'cable'],
-            'Transportation': ['gas', 'fuel', 'uber', 'lyft', 'taxi', 'bus', 'train', 'car payment', 'auto insurance', 'parking'],
-            'Food': ['grocery', 'restaurant', 'food', 'dining', 'coffee', 'lunch', 'dinner', 'breakfast', 'fast food'],
-            'Healthcare': ['medical', 'doctor', 'hospital', 'pharmacy', 'health insurance', 'dental', 'vision'],
-            'Entertainment': ['movie', 'netflix', 'spotify', 'gaming', 'concert', 'theater', 'streaming'],
-            'Shopping': ['amazon', 'target', 'walmart', 'mall', 'store', 'clothing', 'electronics'],
-            'Debt Payment': ['credit card', 'loan payment', 'student loan', 'debt', 'financing'],
-            'Income': ['salary', 'paycheck', 'bonus', 'refund', 'deposit', 'income', 'wages'],
-            'Savings': ['savings', 'investment', 'retirement', '401k', 'ira', 'emergency fund']
+            print(f"{_OK} Word document processing enabled")
+        
+        if self.supported_formats == ['.txt']:
+            print(f"{_WARN} Limited file processing - only text files and sample data available")
+        
+        # Transaction categorization keywords (shared table; copy per instance so edits stay local)
+        self.category_keywords = {category: list(keywords) for category, keywords in self.CATEGORY_KEYWORDS.items()}
+        
+        # One compiled matcher for every keyword of every category
+        self._compile_category_matcher()
+        
+        print(f"{_INFO} Financial Data Processor ready!")
+    
+    def _compile_category_matcher(self) -> None:
+        """
+        🔎 COMPILED CATEGORY MATCHERS
+        
+        Compiles each category's keywords into one regex alternation (and, when
+        pyahocorasick is installed, all keywords into one Aho-Corasick
+        automaton) instead of testing each keyword with a separate substring
+        scan. Checking the category regexes in dict order, or taking the
+        lowest category rank the automaton reports, gives the first category
+        with a matching keyword - the same answer as the original nested loop.
+        
+        The compiled state is cached per keyword table, so every processor
+        with the default keywords shares one set of matchers.
+        """
+        keyword_table = tuple((category, tuple(keywords)) for category, keywords in self.category_keywords.items())
+        self.__dict__.update(self._build_category_matchers(keyword_table))
+    
+    @staticmethod
+    @cache
+    def _build_category_matchers(keyword_table) -> Dict[str, Any]:
+        """🏗️ Build the matcher attributes for a ((category, keywords), ...) table - once per table"""
+        keyword_rank = {}
+        category_order = [category for category, _ in keyword_table]
+        
+        for rank, (_, keywords) in enumerate(keyword_table):
+            for keyword in keywords:
+                keyword_rank.setdefault(keyword, rank)
+        
+        # With pyahocorasick, one automaton reports every keyword occurrence in a
+        # single linear pass over the description (values are category ranks)
+        category_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            try:
+                automaton = _lazy_import('ahocorasick').Automaton()
+                for keyword, rank in keyword_rank.items():
+                    automaton.add_word(keyword, rank)
+                automaton.make_automaton()
+                category_automaton = automaton
+            except Exception as e:
+                print(f"{_WARN} Aho-Corasick matcher unavailable ({e}) - using regex matcher")
+        
+        category_patterns = [
+            (category, re.compile('|'.join(re.escape(keyword) for keyword in keywords)))
+            for category, keywords in keyword_table
+        ]
+        
+        # Descriptions that are exactly one keyword ("netflix", "salary") are
+        # answered by a single hash lookup. Each keyword's category is resolved
+        # with the full priority scan here, so a higher-priority keyword inside
+        # it would still win
+        exact_keyword_category = {
+            keyword: next(category for category, pattern in category_patterns if pattern.search(keyword))
+            for keyword in keyword_rank
         }
         
-        print("📊 Financial Data Processor ready!")
+        return {
+            '_keyword_rank': keyword_rank,
+            '_category_order': category_order,
+            # Lower-cased category names for scanning document text (see _analyze_text_for_financial_data)
+            '_category_names_lower': [(category, category.lower()) for category in category_order],
+            # One alternation per category (priority order) for single and whole-column matching
+            '_category_patterns': category_patterns,
+            '_exact_keyword_category': exact_keyword_category,
+            '_category_automaton': category_automaton
+        }
     
-    def process_document(self, file_path: str) -> Dict[str, Any]:
+    def process_document(self, file_path: str, include_transactions: bool = True) -> Dict[str, Any]:
         """
         ENHANCED DOCUMENT PROCESSING WITH COMPREHENSIVE ERROR HANDLING
         
         INPUTS:
         - file_path: Path to financial document
+        - include_transactions: Build the per-row "transactions" list (CSV/Excel).
+          Pass False when only totals and categories are needed - the list is
+          left empty and its per-row dicts are never allocated
         
         OUTPUTS:
         - Dictionary with structured financial data or detailed error information
@@ -317,11 +547,14 @@ class FinancialDataProcessor:
                      "Ensure required libraries are installed"]
                 )
             
-            # STEP 3: Route to appropriate processor
+            # STEP 3: Route to appropriate processor (only tabular formats load pandas)
+            if file_extension in ('.csv', '.xlsx', '.xls'):
+                _load_pandas()
+            
             if file_extension == '.csv':
-                return self._process_csv(file_path)
+                return self._process_csv(file_path, include_transactions)
             elif file_extension in ['.xlsx', '.xls']:
-                return self._process_excel(file_path)
+                return self._process_excel(file_path, include_transactions)
             elif file_extension == '.pdf':
                 return self._process_pdf(file_path)
             elif file_extension == '.docx':
@@ -346,18 +579,27 @@ class FinancialDataProcessor:
                  "Contact support if the issue persists"]
             )
     
-    def _process_csv(self, file_path: str) -> Dict[str, Any]:
+    def _process_csv(self, file_path: str, include_transactions: bool = True) -> Dict[str, Any]:
         """Enhanced CSV processing with smart column detection"""
         print("📊 Processing CSV file...")
         
         try:
-            # Try multiple encodings
-            encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+            # Sniffed encoding first - the fallbacks only re-read the file if it was wrong
+            encodings_to_try = self._encodings_to_try(file_path, ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1'])
+            
+            # Huge exports never get loaded whole - stream them in row chunks
+            if os.path.getsize(file_path) >= self.CSV_CHUNK_MIN_BYTES:
+                return self._process_csv_chunked(file_path, encodings_to_try, include_transactions)
+            
             df = None
+            known_mapping = None
             
             for encoding in encodings_to_try:
                 try:
-                    df = pd.read_csv(file_path, encoding=encoding)
+                    # Recognized export layout: parse only the columns we use
+                    known_mapping = self._known_csv_schema(file_path, encoding)
+                    usecols = list(known_mapping.values()) if known_mapping else None
+                    df = self._read_csv_fast(file_path, encoding, usecols)
                     print(f"✅ CSV read successfully with {encoding} encoding")
                     break
                 except UnicodeDecodeError:
@@ -385,8 +627,11 @@ class FinancialDataProcessor:
             
             print(f"📊 CSV loaded: {len(df)} rows, {len(df.columns)} columns")
             
-            # Smart column detection
-            column_mapping = self._detect_csv_columns(df)
+            # Smart column detection (known layouts only need the data check)
+            if known_mapping:
+                column_mapping = self._validate_column_mapping(df, known_mapping)
+            else:
+                column_mapping = self._detect_csv_columns(df)
             
             if not column_mapping:
                 return self._create_error_response(
@@ -398,7 +643,7 @@ class FinancialDataProcessor:
                 )
             
             # Process transactions
-            return self._extract_transactions_from_dataframe(df, column_mapping)
+            return self._extract_transactions_from_dataframe(df, column_mapping, include_transactions)
             
         except Exception as e:
             print(f"❌ CSV processing error: {e}")
@@ -410,34 +655,168 @@ class FinancialDataProcessor:
                  "Try opening the file in Excel to verify structure"]
             )
     
-    def _process_excel(self, file_path: str) -> Dict[str, Any]:
+    def _process_csv_chunked(self, file_path: str, encodings_to_try: List[str],
+                             include_transactions: bool = True) -> Dict[str, Any]:
+        """
+        🌊 STREAMING CSV PROCESSING for files too big to load at once
+        
+        Columns are detected on the first chunk, then every chunk runs through
+        the vectorized extractor and is dropped, so peak memory is one chunk
+        plus the extracted transactions rather than the whole DataFrame.
+        """
+        pd, np = _load_pandas()
+        
+        for encoding in encodings_to_try:
+            columns = {"date": [], "amount": [], "category": [], "description": []}
+            data_quality = {}
+            rows_processed = 0
+            
+            try:
+                with pd.read_csv(file_path, encoding=encoding, chunksize=self.CSV_CHUNK_ROWS) as reader:
+                    column_mapping = None
+                    
+                    for chunk in reader:
+                        if column_mapping is None:
+                            column_mapping = self._detect_csv_columns(chunk)
+                            if not column_mapping:
+                                return self._create_error_response(
+                                    "Column Detection Failed",
+                                    "Could not identify required financial columns in the CSV.",
+                                    ["Required columns: Date, Amount, Description/Category",
+                                     "Column names should be in the first row",
+                                     "Example format: Date,Amount,Category,Description"]
+                                )
+                        
+                        chunk_columns = self._transaction_columns_from_dataframe(chunk, column_mapping, data_quality)
+                        for field, values in chunk_columns.items():
+                            columns[field].extend(values)
+                        rows_processed += len(chunk)
+                        log.debug("Streamed %d rows from %s", rows_processed, file_path)
+                
+                print(f"✅ CSV streamed successfully with {encoding} encoding")
+                return self._finish_financial_data(columns, rows_processed, include_transactions, data_quality)
+                
+            except UnicodeDecodeError:
+                # A bad byte can turn up in any chunk - start over with the next encoding
+                print(f"⚠️ Encoding {encoding} failed after {rows_processed:,} rows")
+                continue
+        
+        return self._create_error_response(
+            "CSV Reading Error",
+            "Could not read CSV file with any supported encoding.",
+            ["Ensure the file is a valid CSV",
+             "Try saving the file with UTF-8 encoding",
+             "Check for special characters in the file"]
+        )
+    
+    # Byte-order marks, longest first (the UTF-32-LE BOM starts with the UTF-16-LE one)
+    ENCODING_BOMS = (
+        (codecs.BOM_UTF32_LE, 'utf-32'),
+        (codecs.BOM_UTF32_BE, 'utf-32'),
+        (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16')
+    )
+    
+    def _sniff_encoding(self, file_path: str) -> Optional[str]:
+        """
+        🔎 Recognize a file's encoding from its first 64 KB
+        
+        Only certain answers count: a byte-order mark, or a clean UTF-8 decode.
+        Anything else returns None and the caller keeps its fallback order -
+        statistical detectors misread short Latin-1 files (accented names come
+        out as cp1250 or big5) and a wrong 8-bit codec never raises, so the
+        fallbacks would never get their turn.
+        """
+        
+        with open(file_path, 'rb') as file:
+            head = file.read(65536)
+        
+        for bom, encoding in self.ENCODING_BOMS:
+            if head.startswith(bom):
+                return encoding
+        
+        try:
+            # final=False: a multi-byte character may be cut off at the 64 KB mark
+            codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return None
+    
+    def _encodings_to_try(self, file_path: str, fallbacks: List[str]) -> List[str]:
+        """📋 Sniffed encoding first, then the fallbacks it isn't already"""
+        try:
+            sniffed = self._sniff_encoding(file_path)
+        except Exception as e:
+            print(f"⚠️ Encoding detection failed: {e}")
+            sniffed = None
+        
+        if sniffed is None:
+            return fallbacks
+        return [sniffed] + [encoding for encoding in fallbacks
+                            if codecs.lookup(encoding).name != codecs.lookup(sniffed).name]
+    
+    def _known_csv_schema(self, file_path: str, encoding: str) -> Optional[Dict[str, str]]:
+        """🏦 Column mapping for a recognized export layout (header row only is parsed), else None"""
+        pd, np = _load_pandas()
+        header = tuple(pd.read_csv(file_path, encoding=encoding, nrows=0).columns)
+        known_mapping = self.KNOWN_CSV_SCHEMAS.get(header)
+        if known_mapping:
+            print(f"🏦 Recognized export layout - reading {len(known_mapping)} of {len(header)} columns")
+        return known_mapping
+    
+    def _read_csv_fast(self, file_path: str, encoding: str, usecols: Optional[List[str]] = None):
+        """📥 Read a CSV with pandas' pyarrow engine when installed, the C engine otherwise"""
+        pd, np = _load_pandas()
+        if PYARROW_AVAILABLE:
+            try:
+                if os.path.getsize(file_path) >= self.ARROW_DIRECT_MIN_BYTES:
+                    # Big exports: parse straight into an Arrow table and hand the
+                    # buffers to pandas block-by-block so peak memory stays ~1x the data
+                    from pyarrow import csv as arrow_csv
+                    table = arrow_csv.read_csv(
+                        file_path,
+                        read_options=arrow_csv.ReadOptions(encoding=encoding),
+                        convert_options=arrow_csv.ConvertOptions(include_columns=usecols)
+                    )
+                    return table.to_pandas(split_blocks=True, self_destruct=True)
+                return pd.read_csv(file_path, encoding=encoding, engine='pyarrow', usecols=usecols)
+            except Exception as e:
+                print(f"⚠️ pyarrow CSV engine failed ({e}) - using standard parser")
+        
+        return pd.read_csv(file_path, encoding=encoding, usecols=usecols)
+    
+    def _process_excel(self, file_path: str, include_transactions: bool = True) -> Dict[str, Any]:
         """Enhanced Excel processing with multi-sheet support"""
+        pd, np = _load_pandas()
         print("📈 Processing Excel file...")
         
         try:
-            excel_file = pd.ExcelFile(file_path)
-            sheet_names = excel_file.sheet_names
-            
-            print(f"📈 Excel file has {len(sheet_names)} sheets: {sheet_names}")
-            
-            # Try each sheet to find financial data
-            for sheet_name in sheet_names:
-                try:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    
-                    if df.empty:
-                        continue
-                    
-                    # Try to detect financial columns
-                    column_mapping = self._detect_csv_columns(df)
-                    
-                    if column_mapping:
-                        print(f"✅ Found financial data in sheet: {sheet_name}")
-                        return self._extract_transactions_from_dataframe(df, column_mapping)
+            # Open the workbook once (openpyxl read-only streaming mode) and parse
+            # sheets from that handle instead of re-opening the file per sheet
+            with pd.ExcelFile(file_path) as excel_file:
+                sheet_names = excel_file.sheet_names
+                
+                print(f"📈 Excel file has {len(sheet_names)} sheets: {sheet_names}")
+                
+                # Try each sheet to find financial data
+                for sheet_name in sheet_names:
+                    try:
+                        df = excel_file.parse(sheet_name=sheet_name)
                         
-                except Exception as e:
-                    print(f"⚠️ Error reading sheet {sheet_name}: {e}")
-                    continue
+                        if df.empty:
+                            continue
+                        
+                        # Try to detect financial columns
+                        column_mapping = self._detect_csv_columns(df)
+                        
+                        if column_mapping:
+                            print(f"✅ Found financial data in sheet: {sheet_name}")
+                            return self._extract_transactions_from_dataframe(df, column_mapping, include_transactions)
+                            
+                    except Exception as e:
+                        print(f"⚠️ Error reading sheet {sheet_name}: {e}")
+                        continue
             
             return self._create_error_response(
                 "Excel Processing Failed",
@@ -462,8 +841,10 @@ class FinancialDataProcessor:
         print("📄 Processing PDF file...")
         
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            PyPDF2 = _lazy_import('PyPDF2')
+            
+            with open(file_path, 'rb') as file, self._map_file(file) as pdf_source:
+                pdf_reader = PyPDF2.PdfReader(pdf_source)
                 
                 if len(pdf_reader.pages) == 0:
                     return self._create_error_response(
@@ -473,14 +854,28 @@ class FinancialDataProcessor:
                          "Ensure the PDF is not corrupted"]
                     )
                 
-                # Extract text from all pages
-                full_text = ""
+                # Extract text from all pages (collected and joined once - no quadratic +=)
+                page_results = []
                 for page_num, page in enumerate(pdf_reader.pages):
                     try:
-                        page_text = page.extract_text()
-                        full_text += f"\n--- Page {page_num + 1} ---\n{page_text}"
+                        page_results.append((page_num, page.extract_text(), None))
                     except Exception as e:
-                        print(f"⚠️ Error extracting text from page {page_num + 1}: {e}")
+                        page_results.append((page_num, None, str(e)))
+                
+                # Per-page failures go to the debug log; the console gets one summary line
+                page_texts = []
+                failed_pages = []
+                for page_num, page_text, error in page_results:
+                    if error is None:
+                        page_texts.append(f"\n--- Page {page_num + 1} ---\n{page_text}")
+                    else:
+                        failed_pages.append(page_num + 1)
+                        log.debug("Error extracting text from page %d: %s", page_num + 1, error)
+                full_text = "".join(page_texts)
+                
+                if failed_pages:
+                    print(f"⚠️ Could not extract text from {len(failed_pages)} page(s): {failed_pages[:10]}"
+                          f"{' ...' if len(failed_pages) > 10 else ''}")
                 
                 if not full_text.strip():
                     return self._create_error_response(
@@ -521,26 +916,44 @@ class FinancialDataProcessor:
                  "Try converting to CSV for better results"]
             )
     
+    def _map_file(self, file):
+        """🗺️ Read-only memory map of an open file (pages load on demand); plain file if it can't be mapped"""
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and non-regular files cannot be mapped
+            return nullcontext(file)
+    
     def _process_docx(self, file_path: str) -> Dict[str, Any]:
         """Enhanced Word document processing"""
         print("📝 Processing Word document...")
         
+        try:
+            # find_spec("docx") only proves the package exists; its lxml
+            # dependency is loaded (and can fail) here, on first real use
+            Document = _lazy_import('Document')
+        except ImportError as e:
+            print(f"❌ python-docx could not be loaded: {e}")
+            return self._create_error_response(
+                "Word Support Unavailable",
+                f"python-docx is installed but could not be loaded: {e}",
+                ["Run: python data_processor.py --install-deps",
+                 "Reinstall python-docx and lxml",
+                 "Save the document as CSV or text instead"]
+            )
+        
         try:
             doc = Document(file_path)
             
-            # Extract text from paragraphs
-            full_text = ""
-            for paragraph in doc.paragraphs:
-                full_text += paragraph.text + "\n"
+            # Walk the body's XML elements directly - the Paragraph/Table/_Cell
+            # wrappers (row.cells especially) cost far more than the text itself
+            body = doc.element.body
+            
+            # Extract text from paragraphs (same text as paragraph.text: runs, tabs, breaks, hyperlinks)
+            full_text = "".join(f"{p.text}\n" for p in body.p_lst)
             
-            # Extract text from tables
-            table_data = []
-            for table in doc.tables:
-                for row in table.rows:
-                    row_data = []
-                    for cell in row.cells:
-                        row_data.append(cell.text.strip())
-                    table_data.append(row_data)
+            # Extract text from tables (one entry per row, laid out like row.cells)
+            table_data = [row for tbl in body.tbl_lst for row in self._docx_table_rows(tbl)]
             
             if not full_text.strip() and not table_data:
                 return self._create_error_response(
@@ -579,24 +992,47 @@ class FinancialDataProcessor:
                  "Try saving as text or CSV format"]
             )
     
+    @staticmethod
+    def _docx_table_rows(tbl) -> List[List[str]]:
+        """
+        📋 Cell text for each row of a Word table, on the table's column grid
+        
+        Mirrors python-docx's Table._cells: a cell merged across columns
+        (gridSpan) fills every column it spans, and a vertically merged
+        continuation cell (vMerge) repeats the text of the cell above - the
+        same rows row.cells gives, without building a _Cell per grid slot.
+        """
+        column_count = len(tbl.tblGrid.gridCol_lst)
+        cells = []
+        for tc in tbl.iter_tcs():
+            text = "\n".join(p.text for p in tc.p_lst).strip()
+            for span_index in range(tc.grid_span):
+                if tc.vMerge == "continue":
+                    cells.append(cells[-column_count])
+                elif span_index > 0:
+                    cells.append(cells[-1])
+                else:
+                    cells.append(text)
+        
+        return [cells[row * column_count:(row + 1) * column_count] for row in range(len(tbl.tr_lst))]
+    
     def _process_text(self, file_path: str) -> Dict[str, Any]:
         """Enhanced text file processing"""
         print("📝 Processing text file...")
         
         try:
-            # Try multiple encodings
-            encodings_to_try = ['utf-8', 'latin-1', 'cp1252']
-            content = None
+            # Sniffed encoding first - the fallbacks only re-read the file if it was wrong
+            encodings_to_try = self._encodings_to_try(file_path, ['utf-8', 'latin-1', 'cp1252'])
+            scan = None
             
             for encoding in encodings_to_try:
                 try:
-                    with open(file_path, 'r', encoding=encoding) as file:
-                        content = file.read()
+                    scan = self._scan_text_file(file_path, encoding)
                     break
                 except UnicodeDecodeError:
                     continue
             
-            if content is None:
+            if scan is None:
                 return self._create_error_response(
                     "Text Reading Error",
                     "Could not read text file with any supported encoding.",
@@ -604,19 +1040,20 @@ class FinancialDataProcessor:
                      "Try saving with UTF-8 encoding"]
                 )
             
-            if not content.strip():
+            content_length, has_text, amounts = scan
+            
+            if not has_text:
                 return self._create_error_response(
                     "Empty File",
                     "The text file is empty.",
                     ["Check that the file contains financial data"]
                 )
             
-            # Analyze text for financial patterns
-            financial_patterns = self._analyze_text_for_financial_data(content, [])
+            financial_patterns = {'amounts': amounts}
             
             return {
                 "document_type": "Text Financial Data",
-                "content_length": len(content),
+                "content_length": content_length,
                 "detected_amounts": financial_patterns.get('amounts', []),
                 "processing_notes": [
                     "Text file processing is basic - patterns detected",
@@ -636,36 +1073,67 @@ class FinancialDataProcessor:
                  "Ensure the file is not corrupted"]
             )
     
+    def _scan_text_file(self, file_path: str, encoding: str):
+        """
+        🌊 STREAMING TEXT SCAN
+        
+        Reads the file TEXT_CHUNK_CHARS characters at a time instead of one
+        giant string, so peak memory stays bounded on huge text dumps. Each
+        chunk is cut at its last whitespace (amounts never contain whitespace,
+        so no amount is split or counted twice) and the remainder is carried
+        into the next chunk. Returns (character count, any non-blank text,
+        detected amounts) - the same values a whole-file read would give.
+        """
+        
+        content_length = 0
+        has_text = False
+        amounts = []
+        carry = ""
+        
+        with open(file_path, 'r', encoding=encoding) as file:
+            while True:
+                chunk = file.read(self.TEXT_CHUNK_CHARS)
+                content_length += len(chunk)
+                
+                text = carry + chunk
+                if chunk:
+                    cut = max(text.rfind(' '), text.rfind('\n'), text.rfind('\t'), text.rfind('\r')) + 1
+                    text, carry = text[:cut], text[cut:]
+                
+                has_text = has_text or bool(text.strip())
+                amounts.extend(self._extract_text_amounts(text))
+                
+                if not chunk:
+                    return content_length, has_text, amounts
+    
     def _detect_csv_columns(self, df) -> Optional[Dict[str, str]]:
         """Intelligent column detection for CSV/Excel files"""
         
         column_mapping = {}
-        columns = [col.lower().strip() for col in df.columns]
-        
-        # Define column patterns for intelligent matching
-        column_patterns = {
-            'date': ['date', 'transaction_date', 'posting_date', 'trans_date', 'dt', 'timestamp'],
-            'amount': ['amount', 'transaction_amount', 'debit', 'credit', 'value', 'sum', 'total', 'amt'],
-            'description': ['description', 'memo', 'details', 'transaction_details', 'desc', 'note'],
-            'category': ['category', 'type', 'transaction_type', 'class', 'classification', 'cat']
-        }
+        best_scores = {}
         
-        # Find best matches for each required column
-        for standard_name, patterns in column_patterns.items():
-            best_match = None
-            best_score = 0
-            
-            for col in columns:
-                for pattern in patterns:
-                    if pattern in col or col in pattern:
-                        # Calculate match score (simple scoring)
-                        score = len(pattern) if pattern in col else len(col)
-                        if score > best_score:
-                            best_score = score
-                            best_match = df.columns[columns.index(col)]
+        # One pass over the headers; for each standard name keep the first
+        # header with the highest score (pattern length if the pattern is in
+        # the header, header length if the header is inside a pattern)
+        for original_col in df.columns:
+            col = original_col.lower().strip()
+            exact_match = self.COLUMN_PATTERN_INDEX.get(col)
             
-            if best_match:
-                column_mapping[standard_name] = best_match
+            for standard_name, patterns in self.COLUMN_PATTERNS.items():
+                if standard_name == exact_match:
+                    score = len(col)
+                else:
+                    score = max(
+                        len(pattern) if pattern in col else len(col) if col in pattern else 0
+                        for pattern in patterns
+                    )
+                
+                if score > best_scores.get(standard_name, 0):
+                    best_scores[standard_name] = score
+                    column_mapping[standard_name] = original_col
+        
+        # Keep the original key order (date, amount, description, category)
+        column_mapping = {name: column_mapping[name] for name in self.COLUMN_PATTERNS if column_mapping.get(name)}
         
         # Validate required columns
         required_columns = ['date', 'amount']
@@ -673,11 +1141,21 @@ class FinancialDataProcessor:
             print(f"⚠️ Missing required columns. Found: {list(column_mapping.keys())}")
             return None
         
+        return self._validate_column_mapping(df, column_mapping)
+    
+    def _validate_column_mapping(self, df, column_mapping: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """✔️ Check the mapped amount column actually holds numbers; returns the mapping or None"""
+        pd, np = _load_pandas()
+        
         # Validate data types
         try:
             # Check if amount column contains numeric data
             amount_col = column_mapping['amount']
-            sample_amounts = df[amount_col].dropna().head(10)
+            
+            # First 10 non-empty values: probe a small head before scanning the whole column
+            sample_amounts = df[amount_col].iloc[:64].dropna().head(10)
+            if len(sample_amounts) < 10 and len(df) > 64:
+                sample_amounts = df[amount_col].dropna().head(10)
             
             # Try to convert to numeric
             numeric_amounts = pd.to_numeric(sample_amounts, errors='coerce')
@@ -692,101 +1170,16 @@ class FinancialDataProcessor:
             print(f"⚠️ Column validation error: {e}")
             return None
     
-    def _extract_transactions_from_dataframe(self, df, column_mapping: Dict[str, str]) -> Dict[str, Any]:
+    def _extract_transactions_from_dataframe(self, df, column_mapping: Dict[str, str],
+                                             include_transactions: bool = True) -> Dict[str, Any]:
         """Enhanced transaction extraction and analysis"""
         
         print("💰 Extracting and analyzing transactions...")
         
         try:
-            # Initialize financial data structure
-            financial_data = {
-                "transactions": [],
-                "total_income": 0,
-                "total_expenses": 0,
-                "categories": {},
-                "processing_info": {
-                    "rows_processed": len(df),
-                    "successful_transactions": 0,
-                    "skipped_rows": 0,
-                    "data_quality_issues": []
-                }
-            }
-            
-            # Process each row
-            for index, row in df.iterrows():
-                try:
-                    # Extract basic transaction data
-                    amount_raw = row[column_mapping['amount']]
-                    date_raw = row[column_mapping['date']]
-                    
-                    # Get optional fields
-                    description = ""
-                    if 'description' in column_mapping:
-                        description = str(row[column_mapping['description']]).strip()
-                    
-                    category = ""
-                    if 'category' in column_mapping:
-                        category = str(row[column_mapping['category']]).strip()
-                    
-                    # Clean and validate amount
-                    amount = self._clean_amount(amount_raw)
-                    if amount is None:
-                        financial_data["processing_info"]["skipped_rows"] += 1
-                        continue
-                    
-                    # Clean and validate date
-                    date_str = self._clean_date(date_raw)
-                    
-                    # Determine category (use provided or auto-categorize)
-                    if not category or category.lower() in ['nan', 'none', '']:
-                        category = self._auto_categorize_transaction(description, amount)
-                    
-                    # Create transaction record
-                    transaction = {
-                        "date": date_str,
-                        "amount": amount,
-                        "category": category,
-                        "description": description
-                    }
-                    
-                    financial_data["transactions"].append(transaction)
-                    
-                    # Update totals
-                    if amount > 0:
-                        financial_data["total_income"] += amount
-                    else:
-                        financial_data["total_expenses"] += abs(amount)
-                    
-                    # Update category totals
-                    abs_amount = abs(amount)
-                    if category in financial_data["categories"]:
-                        financial_data["categories"][category] += abs_amount
-                    else:
-                        financial_data["categories"][category] = abs_amount
-                    
-                    financial_data["processing_info"]["successful_transactions"] += 1
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing row {index}: {e}")
-                    financial_data["processing_info"]["skipped_rows"] += 1
-                    financial_data["processing_info"]["data_quality_issues"].append(f"Row {index}: {str(e)}")
-            
-            # Final validation and summary
-            if financial_data["processing_info"]["successful_transactions"] == 0:
-                return self._create_error_response(
-                    "No Valid Transactions",
-                    "Could not extract any valid transactions from the file.",
-                    ["Check that the amount column contains numeric values",
-                     "Ensure the date column has valid dates",
-                     "Verify the file format matches expected structure"]
-                )
-            
-            print(f"✅ Successfully processed {financial_data['processing_info']['successful_transactions']} transactions")
-            
-            if financial_data["processing_info"]["skipped_rows"] > 0:
-                print(f"⚠️ Skipped {financial_data['processing_info']['skipped_rows']} rows due to data issues")
-            
-            return financial_data
+            data_quality = {}
+            columns = self._transaction_columns_from_dataframe(df, column_mapping, data_quality)
+            return self._finish_financial_data(columns, len(df), include_transactions, data_quality)
             
         except Exception as e:
             print(f"❌ Transaction extraction error: {e}")
@@ -798,8 +1191,241 @@ class FinancialDataProcessor:
                  "Review the error details above"]
             )
     
+    def _transaction_columns_from_dataframe(self, df, column_mapping: Dict[str, str],
+                                            data_quality: Optional[Dict[str, Tuple[int, List]]] = None) -> Dict[str, List]:
+        """
+        🧹 Vectorized cleaning + categorization of one DataFrame (or CSV chunk) into parallel field lists
+        
+        Rows rejected for their amount and rows whose date can't be read are
+        tallied into data_quality (see _record_data_quality) when it is given.
+        """
+        pd, np = _load_pandas()
+        
+        # Clean whole columns at once instead of row by row
+        amounts, valid_mask = self._clean_amount_column(df[column_mapping['amount']])
+        valid_rows = df[valid_mask]
+        amounts = amounts[valid_mask].tolist()
+        
+        dates, readable_dates = self._clean_date_column(valid_rows[column_mapping['date']])
+        
+        if data_quality is not None:
+            self._record_data_quality(data_quality, 'amount', df.index[~valid_mask])
+            self._record_data_quality(data_quality, 'date', valid_rows.index[~readable_dates])
+        
+        if 'description' in column_mapping:
+            descriptions = valid_rows[column_mapping['description']].astype(str).str.strip().tolist()
+        else:
+            descriptions = [""] * len(amounts)
+        
+        # Determine category (use provided or auto-categorize)
+        if 'category' in column_mapping:
+            categories = valid_rows[column_mapping['category']].astype(str).str.strip()
+            needs_auto = categories.str.lower().isin(['nan', 'none', '']).tolist()
+            categories = categories.tolist()
+        else:
+            categories = [""] * len(amounts)
+            needs_auto = [True] * len(amounts)
+        
+        auto_rows = np.flatnonzero(needs_auto)
+        if len(auto_rows):
+            auto_categories = self._auto_categorize_column(
+                [descriptions[i] for i in auto_rows], np.asarray(amounts)[auto_rows]
+            )
+            # Scatter the auto categories back with one fancy-index assignment (no per-row loop)
+            categories = np.array(categories, dtype=object)
+            categories[auto_rows] = auto_categories
+            categories = categories.tolist()
+        
+        return {"date": dates, "amount": amounts, "category": categories, "description": descriptions}
+    
+    def _record_data_quality(self, data_quality: Dict[str, Tuple[int, List]], kind: str, row_labels) -> None:
+        """📝 Add rows with one kind of problem to the tally: kind -> (row count, first few row numbers)"""
+        if len(row_labels) == 0:
+            return
+        
+        count, sample_rows = data_quality.get(kind, (0, []))
+        room = self.DATA_QUALITY_SAMPLE_ROWS - len(sample_rows)
+        data_quality[kind] = (count + len(row_labels), sample_rows + list(row_labels[:room]))
+    
+    def _data_quality_issues(self, data_quality: Optional[Dict[str, Tuple[int, List]]]) -> List[str]:
+        """📋 One readable message per kind of problem found during extraction"""
+        issues = []
+        for kind, message in self.DATA_QUALITY_MESSAGES.items():
+            if kind not in (data_quality or {}):
+                continue
+            count, sample_rows = data_quality[kind]
+            rows = ", ".join(str(row) for row in sample_rows) + (", ..." if count > len(sample_rows) else "")
+            issues.append(f"{count} row(s): {message} (rows {rows})")
+        return issues
+    
+    def _finish_financial_data(self, columns: Dict[str, List], rows_processed: int,
+                               include_transactions: bool = True,
+                               data_quality: Optional[Dict[str, Tuple[int, List]]] = None) -> Dict[str, Any]:
+        """
+        📦 Wrap extracted transaction columns with processing info, totals and category sums
+        
+        Totals come straight from the columns; the per-row transaction dicts are
+        only built when include_transactions is True (aggregate-only callers
+        get an empty list and skip that allocation entirely).
+        """
+        
+        transaction_count = len(columns["amount"])
+        
+        transactions = []
+        if include_transactions:
+            transactions = [
+                {
+                    "date": date_str,
+                    "amount": amount,
+                    "category": category,
+                    "description": description
+                }
+                for date_str, amount, category, description in zip(
+                    columns["date"], columns["amount"], columns["category"], columns["description"]
+                )
+            ]
+        
+        financial_data = {
+            "transactions": transactions,
+            "total_income": 0,
+            "total_expenses": 0,
+            "categories": {},
+            "processing_info": {
+                "rows_processed": rows_processed,
+                "successful_transactions": transaction_count,
+                "skipped_rows": rows_processed - transaction_count,
+                "data_quality_issues": self._data_quality_issues(data_quality)
+            }
+        }
+        
+        # Final validation and summary
+        if financial_data["processing_info"]["successful_transactions"] == 0:
+            return self._create_error_response(
+                "No Valid Transactions",
+                "Could not extract any valid transactions from the file.",
+                ["Check that the amount column contains numeric values",
+                 "Ensure the date column has valid dates",
+                 "Verify the file format matches expected structure"]
+            )
+        
+        # Totals and category sums in one vectorized pass
+        self._summarize_transactions(financial_data, columns["amount"], columns["category"])
+        
+        print(f"✅ Successfully processed {financial_data['processing_info']['successful_transactions']} transactions")
+        
+        if financial_data["processing_info"]["skipped_rows"] > 0:
+            print(f"⚠️ Skipped {financial_data['processing_info']['skipped_rows']} rows due to data issues")
+        
+        return financial_data
+    
+    def _summarize_transactions(self, financial_data: Dict[str, Any], amounts: List[float], categories: List[str]) -> None:
+        """
+        📊 VECTORIZED TOTALS
+        
+        Fills total_income, total_expenses and per-category totals (absolute
+        amounts, first-seen category order) with pandas masks and a groupby
+        instead of updating dicts row by row.
+        """
+        pd, np = _load_pandas()
+        amounts = pd.Series(amounts, dtype=float)
+        abs_amounts = amounts.abs()
+        
+        financial_data["total_income"] = float(amounts[amounts > 0].sum())
+        financial_data["total_expenses"] = float(abs_amounts[amounts <= 0].sum())
+        
+        category_totals = abs_amounts.groupby(pd.Series(categories, dtype=object), sort=False).sum()
+        financial_data["categories"] = {category: float(total) for category, total in category_totals.items()}
+    
+    def _clean_amount_column(self, amount_column):
+        """
+        💵 VECTORIZED AMOUNT CLEANING
+        
+        Same rules as _clean_amount, applied to a whole column. Returns
+        (float64 amounts, valid mask); rows that _clean_amount would reject
+        are False in the mask. Numeric columns convert directly. Text columns
+        are factorized first, so the vectorized string cleanup and the float()
+        parse run once per distinct string - float() exactly as _clean_amount
+        does (pandas' to_numeric can differ from float() in the last digit).
+        """
+        pd, np = _load_pandas()
+        
+        present = amount_column.notna().to_numpy()
+        
+        if pd.api.types.is_numeric_dtype(amount_column) and not pd.api.types.is_bool_dtype(amount_column):
+            return amount_column.to_numpy(dtype='float64', na_value=np.nan), present
+        
+        # Statements repeat the same amounts constantly - clean each distinct string once
+        codes, unique_texts = pd.factorize(amount_column[present].astype(str))
+        unique_texts = pd.Series(unique_texts, dtype=object).str.replace(self.AMOUNT_CLEAN_RE, '', regex=True)
+        
+        # Handle parentheses (negative numbers)
+        in_parentheses = unique_texts.str.startswith('(') & unique_texts.str.endswith(')')
+        unique_texts = unique_texts.where(~in_parentheses, '-' + unique_texts.str[1:-1])
+        
+        parsed = [self._parse_amount_text(text) for text in unique_texts]
+        unique_valid = np.array([value is not None for value in parsed], dtype=bool)
+        unique_values = np.array([np.nan if value is None else value for value in parsed], dtype='float64')
+        
+        amounts = np.full(len(amount_column), np.nan)
+        valid_mask = np.zeros(len(amount_column), dtype=bool)
+        amounts[present] = unique_values[codes]
+        valid_mask[present] = unique_valid[codes]
+        return amounts, valid_mask
+    
+    def _parse_amount_text(self, amount_text: str) -> Optional[float]:
+        """🔢 float() of an already-cleaned amount string, None if it is not a number"""
+        try:
+            return float(amount_text)
+        except (ValueError, TypeError):
+            return None
+    
+    def _clean_date_column(self, date_column) -> Tuple[List[str], Any]:
+        """
+        📅 _clean_date for a whole column - each distinct value is parsed once, sniffed format first
+        
+        Returns (cleaned dates, readable mask); the mask is False for missing
+        dates and for values _clean_date could only keep as written.
+        """
+        pd, np = _load_pandas()
+        
+        present = date_column.notna().to_numpy()
+        cleaned = np.full(len(date_column), "Unknown", dtype=object)
+        readable = np.zeros(len(date_column), dtype=bool)
+        
+        codes, unique_dates = pd.factorize(date_column[present].map(str))
+        unique_cleaned = np.array(self._clean_date_values(unique_dates), dtype=object)
+        unique_readable = pd.to_datetime(unique_cleaned, format='%Y-%m-%d', errors='coerce').notna()
+        cleaned[present] = unique_cleaned[codes]
+        readable[present] = unique_readable[codes]
+        return cleaned.tolist(), readable
+    
+    def _clean_date_values(self, date_texts) -> List[str]:
+        """
+        📅 Format-sniffed date parsing for distinct date strings
+        
+        The first DATE_FORMATS entry that parses a small sample is applied to
+        every value in one vectorized to_datetime call; only values it can't
+        read go through _clean_date's per-value format guessing.
+        """
+        pd, np = _load_pandas()
+        
+        sample = date_texts[:5]
+        date_format = next(
+            (fmt for fmt in self.DATE_FORMATS if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all()),
+            None
+        )
+        if date_format is None:
+            return [self._clean_date(date_text) for date_text in date_texts]
+        
+        formatted = pd.to_datetime(date_texts, format=date_format, errors='coerce').strftime('%Y-%m-%d')
+        return [
+            self._clean_date(date_text) if pd.isna(value) else value
+            for date_text, value in zip(date_texts, formatted)
+        ]
+    
     def _clean_amount(self, amount_raw) -> Optional[float]:
         """Clean and validate amount values"""
+        pd, np = _load_pandas()
         try:
             if pd.isna(amount_raw):
                 return None
@@ -808,7 +1434,7 @@ class FinancialDataProcessor:
             amount_str = str(amount_raw).strip()
             
             # Remove currency symbols and commas
-            amount_str = re.sub(r'[\$,\s]', '', amount_str)
+            amount_str = self.AMOUNT_CLEAN_RE.sub('', amount_str)
             
             # Handle parentheses (negative numbers)
             if amount_str.startswith('(') and amount_str.endswith(')'):
@@ -822,6 +1448,7 @@ class FinancialDataProcessor:
     
     def _clean_date(self, date_raw) -> str:
         """Clean and format date values"""
+        pd, np = _load_pandas()
         try:
             if pd.isna(date_raw):
                 return "Unknown"
@@ -848,14 +1475,52 @@ class FinancialDataProcessor:
         
         description_lower = description.lower()
         
-        # Check each category for keyword matches
-        for category, keywords in self.category_keywords.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return category
+        category = self._exact_keyword_category.get(description_lower)
+        if category is not None:
+            return category
+        
+        # Lowest-ranked keyword anywhere in the description wins
+        if self._category_automaton is not None:
+            best_rank = None
+            for _, rank in self._category_automaton.iter(description_lower):
+                if best_rank is None or rank < best_rank:
+                    best_rank = rank
+                    if rank == 0:
+                        break
+            
+            if best_rank is not None:
+                return self._category_order[best_rank]
+        else:
+            # Categories in priority order - the first one with any keyword hit wins
+            for category, pattern in self._category_patterns:
+                if pattern.search(description_lower):
+                    return category
         
         # Default categorization based on amount
         return "Income" if amount > 0 else "Other Expenses"
     
+    def _auto_categorize_column(self, descriptions: List[str], amounts) -> List[str]:
+        """
+        🏷️ VECTORIZED AUTO-CATEGORIZATION
+        
+        Same answer as _auto_categorize_transaction for every row: each
+        category's keyword regex is run over the distinct lower-cased
+        descriptions with Series.str.contains, and np.select picks the first
+        (highest-priority) category that matched. Rows with no match, or no
+        description, fall back to Income / Other Expenses by sign.
+        """
+        pd, np = _load_pandas()
+        
+        codes, unique_descriptions = pd.factorize(pd.Series(descriptions, dtype=object))
+        lowered = pd.Series(unique_descriptions, dtype=object).str.lower()
+        
+        matches = [lowered.str.contains(pattern, regex=True).to_numpy(dtype=bool) for _, pattern in self._category_patterns]
+        unique_categories = np.select(matches, [category for category, _ in self._category_patterns], default="")
+        
+        categories = unique_categories[codes]
+        by_sign = np.where(np.asarray(amounts) > 0, "Income", "Other Expenses")
+        return np.where(categories == "", by_sign, categories).tolist()
+    
     def _analyze_pdf_text(self, text: str) -> Dict[str, List]:
         """Analyze PDF text for financial patterns"""
         
@@ -866,27 +1531,12 @@ class FinancialDataProcessor:
         }
         
         # Extract dollar amounts
-        amount_pattern = r'\$[\d,]+\.?\d*'
-        amounts = re.findall(amount_pattern, text)
-        for amt_str in amounts:
-            try:
-                cleaned = amt_str.replace(',', '').replace('$', '').replace(' ', '')
-                amount = float(cleaned)
-                #amount = float(amt_str.replace(', '').replace(',', ''))
-                patterns['amounts'].append(amount)
-            except ValueError:
-                continue
-        
-        # Extract dates
-        date_patterns = [
-            r'\d{1,2}/\d{1,2}/\d{4}',
-            r'\d{1,2}-\d{1,2}-\d{4}',
-            r'\d{4}-\d{1,2}-\d{1,2}'
-        ]
+        patterns['amounts'] = self._parse_amount_matches(self.PDF_AMOUNT_RE.findall(text))
         
-        for pattern in date_patterns:
-            dates = re.findall(pattern, text)
-            patterns['dates'].extend(dates)
+        # Extract dates - one scan per layout, so a date overlapping an amount or
+        # another layout's match is still found
+        for date_re in self.DATE_RES:
+            patterns['dates'].extend(date_re.findall(text))
         
         return patterns
     
@@ -899,26 +1549,38 @@ class FinancialDataProcessor:
         }
         
         # Extract amounts from text
-        amount_pattern = r'\$?[\d,]+\.?\d*'
-        amounts = re.findall(amount_pattern, text)
+        patterns['amounts'] = self._extract_text_amounts(text)
         
-        for amt_str in amounts:
-            try:
-                #amount = float(amt_str.replace(', '').replace(',', ''))
-                cleaned = amt_str.replace(',', '').replace('$', '').replace(' ', '')
-                amount = float(cleaned)
-                if amount > 0:  # Only include meaningful amounts
-                    patterns['amounts'].append(amount)
-            except ValueError:
-                continue
-        
-        # Extract potential categories from text
-        for category in self.category_keywords.keys():
-            if category.lower() in text.lower():
-                patterns['categories'].append(category)
+        # Extract potential categories from text (one lower-cased copy, C-level substring scans)
+        text_lower = text.lower()
+        patterns['categories'] = [category for category, name_lower in self._category_names_lower if name_lower in text_lower]
         
         return patterns
     
+    def _extract_text_amounts(self, text: str) -> List[float]:
+        """💲 Positive dollar-like amounts found in free text"""
+        
+        # Only include meaningful amounts
+        return [amount for amount in self._parse_amount_matches(self.TEXT_AMOUNT_RE.findall(text)) if amount > 0]
+    
+    def _parse_amount_matches(self, amount_strings: List[str]) -> List[float]:
+        """
+        🔢 BULK AMOUNT PARSING for regex matches
+        
+        Joins every match, strips ',$ ' with one translate over the joined
+        string, splits it back and runs float() through map() - the per-match
+        work stays in C. Matches that clean to nothing (a lone ',') are
+        skipped, as the per-match try/float loop did. Plain Python on purpose:
+        text documents are processed without pandas/numpy.
+        """
+        
+        cleaned = "\n".join(amount_strings).translate(self.AMOUNT_STRIP_TABLE).split("\n")
+        try:
+            return list(map(float, filter(None, cleaned)))
+        except ValueError:
+            # Something float() rejects slipped through - parse one at a time
+            return [amount for amount in map(self._parse_amount_text, cleaned) if amount is not None]
+    
     def _create_error_response(self, error_type: str, message: str, suggestions: List[str]) -> Dict[str, Any]:
         """Create standardized error response with helpful guidance"""
         
@@ -964,98 +1626,108 @@ def create_sample_data() -> Dict[str, Any]:
     - Monthly expenses: $3,450 (various categories)
     - Net savings potential: $1,750/month
     - Demonstrates both good and challenging financial situations
+    
+    The data only depends on today's date, so it is built once per day and
+    each caller gets its own copy (safe to modify).
     """
     
+    return copy_plain_data(_build_sample_data(date.today()))
+
+def copy_plain_data(value):
+    """📋 Copy nested dicts/lists of plain values - parsed documents included (much cheaper than copy.deepcopy)"""
+    if isinstance(value, dict):
+        return {key: copy_plain_data(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_plain_data(item) for item in value]
+    return value
+
+@lru_cache(maxsize=1)
+def _build_sample_data(today: date) -> Dict[str, Any]:
+    """📊 Build the sample data set dated relative to `today` (cached - use create_sample_data)"""
+    
     print("📊 Generating comprehensive sample financial data...")
     
     # Create realistic transaction data
-    base_date = datetime.now() - timedelta(days=30)
+    base_date = today - timedelta(days=30)
+    
+    # Date strings for each day of the month, formatted once (day[n] = base_date + n days)
+    day = [(base_date + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(31)]
     
     sample_transactions = [
         # INCOME TRANSACTIONS
-        {"date": (base_date + timedelta(days=1)).strftime('%Y-%m-%d'), "amount": 4200.00, "category": "Salary", "description": "Monthly Salary - Company XYZ"},
-        {"date": (base_date + timedelta(days=15)).strftime('%Y-%m-%d'), "amount": 800.00, "category": "Side Income", "description": "Freelance Project Payment"},
-        {"date": (base_date + timedelta(days=20)).strftime('%Y-%m-%d'), "amount": 200.00, "category": "Other Income", "description": "Tax Refund"},
+        {"date": day[1], "amount": 4200.00, "category": "Salary", "description": "Monthly Salary - Company XYZ"},
+        {"date": day[15], "amount": 800.00, "category": "Side Income", "description": "Freelance Project Payment"},
+        {"date": day[20], "amount": 200.00, "category": "Other Income", "description": "Tax Refund"},
         
         # HOUSING & UTILITIES
-        {"date": (base_date + timedelta(days=1)).strftime('%Y-%m-%d'), "amount": -1250.00, "category": "Housing", "description": "Monthly Rent Payment"},
-        {"date": (base_date + timedelta(days=5)).strftime('%Y-%m-%d'), "amount": -120.00, "category": "Utilities", "description": "Electric Bill"},
-        {"date": (base_date + timedelta(days=7)).strftime('%Y-%m-%d'), "amount": -80.00, "category": "Utilities", "description": "Internet & Cable"},
-        {"date": (base_date + timedelta(days=10)).strftime('%Y-%m-%d'), "amount": -45.00, "category": "Utilities", "description": "Water Bill"},
+        {"date": day[1], "amount": -1250.00, "category": "Housing", "description": "Monthly Rent Payment"},
+        {"date": day[5], "amount": -120.00, "category": "Utilities", "description": "Electric Bill"},
+        {"date": day[7], "amount": -80.00, "category": "Utilities", "description": "Internet & Cable"},
+        {"date": day[10], "amount": -45.00, "category": "Utilities", "description": "Water Bill"},
         
         # TRANSPORTATION
-        {"date": (base_date + timedelta(days=3)).strftime('%Y-%m-%d'), "amount": -350.00, "category": "Transportation", "description": "Car Payment"},
-        {"date": (base_date + timedelta(days=8)).strftime('%Y-%m-%d'), "amount": -55.00, "category": "Transportation", "description": "Gas Station Fill-up"},
-        {"date": (base_date + timedelta(days=15)).strftime('%Y-%m-%d'), "amount": -60.00, "category": "Transportation", "description": "Gas Station Fill-up"},
-        {"date": (base_date + timedelta(days=22)).strftime('%Y-%m-%d'), "amount": -45.00, "category": "Transportation", "description": "Gas Station Fill-up"},
-        {"date": (base_date + timedelta(days=12)).strftime('%Y-%m-%d'), "amount": -25.00, "category": "Transportation", "description": "Parking Fee"},
+        {"date": day[3], "amount": -350.00, "category": "Transportation", "description": "Car Payment"},
+        {"date": day[8], "amount": -55.00, "category": "Transportation", "description": "Gas Station Fill-up"},
+        {"date": day[15], "amount": -60.00, "category": "Transportation", "description": "Gas Station Fill-up"},
+        {"date": day[22], "amount": -45.00, "category": "Transportation", "description": "Gas Station Fill-up"},
+        {"date": day[12], "amount": -25.00, "category": "Transportation", "description": "Parking Fee"},
         
         # FOOD & DINING
-        {"date": (base_date + timedelta(days=2)).strftime('%Y-%m-%d'), "amount": -120.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
-        {"date": (base_date + timedelta(days=9)).strftime('%Y-%m-%d'), "amount": -115.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
-        {"date": (base_date + timedelta(days=16)).strftime('%Y-%m-%d'), "amount": -130.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
-        {"date": (base_date + timedelta(days=23)).strftime('%Y-%m-%d'), "amount": -125.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
-        {"date": (base_date + timedelta(days=6)).strftime('%Y-%m-%d'), "amount": -45.00, "category": "Dining Out", "description": "Restaurant Dinner"},
-        {"date": (base_date + timedelta(days=13)).strftime('%Y-%m-%d'), "amount": -35.00, "category": "Dining Out", "description": "Lunch with Colleagues"},
-        {"date": (base_date + timedelta(days=19)).strftime('%Y-%m-%d'), "amount": -25.00, "category": "Dining Out", "description": "Coffee Shop"},
+        {"date": day[2], "amount": -120.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
+        {"date": day[9], "amount": -115.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
+        {"date": day[16], "amount": -130.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
+        {"date": day[23], "amount": -125.00, "category": "Groceries", "description": "Weekly Grocery Shopping"},
+        {"date": day[6], "amount": -45.00, "category": "Dining Out", "description": "Restaurant Dinner"},
+        {"date": day[13], "amount": -35.00, "category": "Dining Out", "description": "Lunch with Colleagues"},
+        {"date": day[19], "amount": -25.00, "category": "Dining Out", "description": "Coffee Shop"},
         
         # HEALTHCARE
-        {"date": (base_date + timedelta(days=14)).strftime('%Y-%m-%d'), "amount": -150.00, "category": "Healthcare", "description": "Doctor Visit Copay"},
-        {"date": (base_date + timedelta(days=18)).strftime('%Y-%m-%d'), "amount": -35.00, "category": "Healthcare", "description": "Prescription Medication"},
+        {"date": day[14], "amount": -150.00, "category": "Healthcare", "description": "Doctor Visit Copay"},
+        {"date": day[18], "amount": -35.00, "category": "Healthcare", "description": "Prescription Medication"},
         
         # ENTERTAINMENT & LIFESTYLE
-        {"date": (base_date + timedelta(days=4)).strftime('%Y-%m-%d'), "amount": -15.99, "category": "Entertainment", "description": "Netflix Subscription"},
-        {"date": (base_date + timedelta(days=11)).strftime('%Y-%m-%d'), "amount": -12.99, "category": "Entertainment", "description": "Spotify Premium"},
-        {"date": (base_date + timedelta(days=17)).strftime('%Y-%m-%d'), "amount": -45.00, "category": "Entertainment", "description": "Movie Theater Tickets"},
-        {"date": (base_date + timedelta(days=24)).strftime('%Y-%m-%d'), "amount": -85.00, "category": "Entertainment", "description": "Concert Tickets"},
+        {"date": day[4], "amount": -15.99, "category": "Entertainment", "description": "Netflix Subscription"},
+        {"date": day[11], "amount": -12.99, "category": "Entertainment", "description": "Spotify Premium"},
+        {"date": day[17], "amount": -45.00, "category": "Entertainment", "description": "Movie Theater Tickets"},
+        {"date": day[24], "amount": -85.00, "category": "Entertainment", "description": "Concert Tickets"},
         
         # SHOPPING & PERSONAL
-        {"date": (base_date + timedelta(days=5)).strftime('%Y-%m-%d'), "amount": -65.00, "category": "Shopping", "description": "Clothing Store"},
-        {"date": (base_date + timedelta(days=21)).strftime('%Y-%m-%d'), "amount": -120.00, "category": "Shopping", "description": "Amazon Purchase"},
-        {"date": (base_date + timedelta(days=26)).strftime('%Y-%m-%d'), "amount": -40.00, "category": "Personal Care", "description": "Haircut"},
+        {"date": day[5], "amount": -65.00, "category": "Shopping", "description": "Clothing Store"},
+        {"date": day[21], "amount": -120.00, "category": "Shopping", "description": "Amazon Purchase"},
+        {"date": day[26], "amount": -40.00, "category": "Personal Care", "description": "Haircut"},
         
         # DEBT PAYMENTS
-        {"date": (base_date + timedelta(days=3)).strftime('%Y-%m-%d'), "amount": -185.00, "category": "Debt Payment", "description": "Credit Card Payment"},
-        {"date": (base_date + timedelta(days=25)).strftime('%Y-%m-%d'), "amount": -75.00, "category": "Debt Payment", "description": "Student Loan Payment"},
+        {"date": day[3], "amount": -185.00, "category": "Debt Payment", "description": "Credit Card Payment"},
+        {"date": day[25], "amount": -75.00, "category": "Debt Payment", "description": "Student Loan Payment"},
         
         # INSURANCE
-        {"date": (base_date + timedelta(days=1)).strftime('%Y-%m-%d'), "amount": -95.00, "category": "Insurance", "description": "Auto Insurance"},
-        {"date": (base_date + timedelta(days=15)).strftime('%Y-%m-%d'), "amount": -200.00, "category": "Insurance", "description": "Health Insurance Premium"},
+        {"date": day[1], "amount": -95.00, "category": "Insurance", "description": "Auto Insurance"},
+        {"date": day[15], "amount": -200.00, "category": "Insurance", "description": "Health Insurance Premium"},
         
         # SAVINGS & INVESTMENTS
-        {"date": (base_date + timedelta(days=2)).strftime('%Y-%m-%d'), "amount": -300.00, "category": "Savings", "description": "Emergency Fund Transfer"},
-        {"date": (base_date + timedelta(days=16)).strftime('%Y-%m-%d'), "amount": -400.00, "category": "Investment", "description": "401k Contribution"},
+        {"date": day[2], "amount": -300.00, "category": "Savings", "description": "Emergency Fund Transfer"},
+        {"date": day[16], "amount": -400.00, "category": "Investment", "description": "401k Contribution"},
         
         # MISCELLANEOUS
-        {"date": (base_date + timedelta(days=28)).strftime('%Y-%m-%d'), "amount": -50.00, "category": "Other", "description": "ATM Withdrawal"},
-        {"date": (base_date + timedelta(days=29)).strftime('%Y-%m-%d'), "amount": -25.00, "category": "Fees", "description": "Bank Service Fee"}
+        {"date": day[28], "amount": -50.00, "category": "Other", "description": "ATM Withdrawal"},
+        {"date": day[29], "amount": -25.00, "category": "Fees", "description": "Bank Service Fee"}
     ]
     
-    # Calculate totals and categories
-    total_income = sum(t['amount'] for t in sample_transactions if t['amount'] > 0)
-    total_expenses = sum(abs(t['amount']) for t in sample_transactions if t['amount'] < 0)
-    
-    # Group expenses by category for analysis
-    expense_categories = {}
+    # Calculate totals and group expenses and income by category - all in one pass
+    total_income = 0
+    total_expenses = 0
+    expense_categories = defaultdict(float)
+    income_categories = defaultdict(float)
     for transaction in sample_transactions:
-        if transaction['amount'] < 0:  # Only expenses
-            category = transaction['category']
-            amount = abs(transaction['amount'])
-            if category in expense_categories:
-                expense_categories[category] += amount
-            else:
-                expense_categories[category] = amount
-    
-    # Add income categories
-    income_categories = {}
-    for transaction in sample_transactions:
-        if transaction['amount'] > 0:  # Only income
-            category = transaction['category']
-            amount = transaction['amount']
-            if category in income_categories:
-                income_categories[category] += amount
-            else:
-                income_categories[category] = amount
+        amount = transaction['amount']
+        if amount < 0:  # Expenses
+            total_expenses -= amount
+            expense_categories[transaction['category']] -= amount
+        elif amount > 0:  # Income
+            total_income += amount
+            income_categories[transaction['category']] += amount
+    expense_categories = dict(expense_categories)
+    income_categories = dict(income_categories)
     
     # Combine all categories for comprehensive analysis
     all_categories = {**expense_categories, **income_categories}
@@ -1093,6 +1765,51 @@ def create_sample_data() -> Dict[str, Any]:
     
     return sample_data
 
+# ============================================================================
+# COLUMNAR TRANSACTION VIEW - Struct-of-Arrays for vectorized agents
+# ============================================================================
+
+def build_transaction_columns(financial_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    🧮 STRUCT-OF-ARRAYS TRANSACTION VIEW
+    
+    WHAT THIS FUNCTION DOES:
+    Converts the list of transaction dicts into parallel NumPy arrays, once,
+    so agents can filter with masks instead of looping over dicts:
+    - amounts: float64 (kept at full precision so cents add up exactly)
+    - dates: datetime64 (unparseable dates become NaT)
+    - category_codes: int32 index into category_names
+    - category_names / category_index: code <-> category lookups
+    
+    The arrays live outside financial_data so that dict stays JSON-friendly.
+    Returns None when pandas/numpy are not available.
+    """
+    
+    if not PANDAS_AVAILABLE:
+        return None
+    
+    pd, np = _load_pandas()
+    transactions = financial_data.get('transactions', [])
+    count = len(transactions)
+    
+    amounts = np.fromiter((t.get('amount', 0) for t in transactions), dtype=np.float64, count=count)
+    dates = pd.to_datetime([t.get('date') for t in transactions], format='%Y-%m-%d', errors='coerce').values
+    
+    # Dictionary-encode categories in first-seen order
+    category_index = {}
+    category_codes = np.fromiter(
+        (category_index.setdefault(t.get('category', ''), len(category_index)) for t in transactions),
+        dtype=np.int32, count=count
+    )
+    
+    return {
+        'amounts': amounts,
+        'dates': dates,
+        'category_codes': category_codes,
+        'category_names': list(category_index),
+        'category_index': category_index
+    }
+
 # ============================================================================
 # SELF-TEST FUNCTION - Validate Data Processor Capabilities
 # ============================================================================
@@ -1111,6 +1828,8 @@ def test_data_processor_capabilities():
     print("🧪 Testing Financial Data Processor capabilities...")
     print("=" * 50)
     
+    check_document_processing_dependencies()
+    
     # Test processor initialization
     try:
         processor = FinancialDataProcessor()
@@ -1132,6 +1851,7 @@ def test_data_processor_capabilities():
         # Test column detection (if pandas available)
         if PANDAS_AVAILABLE:
             print("🔍 Testing column detection...")
+            pd, np = _load_pandas()
             # Create test dataframe
             test_df = pd.DataFrame({
                 'Transaction Date': ['2024-01-01', '2024-01-02'],
@@ -1176,6 +1896,12 @@ if __name__ == "__main__":
     print("📊 Financial Data Processor - Standalone Testing")
     print("=" * 60)
     
+    if "--install-deps" in sys.argv[1:]:
+        ensure_document_dependencies()
+    
+    if "--freeze-capabilities" in sys.argv[1:]:
+        freeze_document_capabilities()
+    
     success = test_data_processor_capabilities()
     
     if success:
@@ -1183,7 +1909,7 @@ if __name__ == "__main__":
         print("📁 Sample data generation working perfectly")
     else:
         print("❌ Some issues detected - check error messages above")
-        print("💡 Try: pip install pandas openpyxl PyPDF2 python-docx")
+        print("💡 Try: python data_processor.py --install-deps")
 
 # ============================================================================
 # END OF ENHANCED DATA PROCESSOR
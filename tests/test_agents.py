@@ -0,0 +1,99 @@
+"""Tests for agents.py - run with: python -m unittest discover tests"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import agents
+from agents import AgentRouter, BudgetAdvisorAgent
+
+
+def _profile(housing):
+    return {
+        'total_income': 4000.0,
+        'total_expenses': housing + 400.0,
+        'categories': {'Housing': housing, 'Food': 400.0},
+        'transactions': [],
+    }
+
+
+class AgentRouterTest(unittest.TestCase):
+    """The router may reuse an answer's wording, never another profile's numbers"""
+
+    def setUp(self):
+        self.router = AgentRouter()
+        self.original = _profile(1200.0)
+        self.near_identical = _profile(1170.0)
+        self.fingerprint = self.router.fingerprint("budget_advisor", self.original)
+
+    def test_near_identical_profile_shares_fingerprint(self):
+        self.assertEqual(self.router.fingerprint("budget_advisor", self.near_identical), self.fingerprint)
+
+    def test_near_identical_profile_gets_its_own_numbers(self):
+        answer = ("🤖 Budget Advisor AI Analysis\n\n"
+                  "1. Income of $4,000 covers $1,600.00 of expenses, leaving $2,400.\n"
+                  "2. Housing costs $1,200 and Food costs $400.")
+        self.router.remember(self.fingerprint, answer, self.original)
+        
+        self.assertEqual(self.router.lookup(self.fingerprint, self.original), answer)
+        
+        reused = self.router.lookup(self.router.fingerprint("budget_advisor", self.near_identical), self.near_identical)
+        self.assertEqual(reused, ("🤖 Budget Advisor AI Analysis\n\n"
+                                  "1. Income of $4,000 covers $1,570.00 of expenses, leaving $2,430.\n"
+                                  "2. Housing costs $1,170 and Food costs $400."))
+        for stale_number in ("1,200", "1,600", "2,400"):
+            self.assertNotIn(stale_number, reused)
+
+    def test_answers_with_derived_numbers_are_not_reused(self):
+        for answer in ("🤖 Budget Advisor AI Analysis\n\nHousing takes 30% of your $4,000 income.",
+                       "🤖 Budget Advisor AI Analysis\n\nMove $300 a month into savings.",
+                       "🤖 Budget Advisor AI Analysis\n\nYou will be debt-free in 14 months."):
+            self.router.remember(self.fingerprint, answer, self.original)
+            self.assertIsNone(self.router.lookup(self.fingerprint, self.near_identical))
+
+    def test_requests_with_transactions_are_never_routed(self):
+        with_transactions = dict(self.original, transactions=[{'description': 'Rent', 'amount': -1200.0}])
+        fingerprint = self.router.fingerprint("budget_advisor", with_transactions)
+        
+        self.assertIsNone(fingerprint)
+        self.router.remember(fingerprint, "🤖 Budget Advisor AI Analysis\n\nHousing costs $1,200.", with_transactions)
+        self.assertEqual(len(self.router.responses), 0)
+
+
+class BudgetAdvisorTest(unittest.TestCase):
+    """The budget report and prompt come from the category totals alone"""
+
+    def setUp(self):
+        self.advisor = BudgetAdvisorAgent()
+        self.advisor.ai_available = False
+        self.financial_data = {
+            'total_income': 5000.0,
+            'total_expenses': 3000.0,
+            'categories': {'Housing': 1500.0, 'Dining Out': 900.0, 'Savings Transfer': 600.0},
+            'transactions': [],
+        }
+
+    def test_report_does_not_depend_on_transactions(self):
+        with_transactions = dict(self.financial_data, transactions=[
+            {'date': '2024-01-01', 'description': 'Rent', 'amount': -1500.0, 'category': 'Housing'},
+            {'date': '2024-01-02', 'description': 'Bistro', 'amount': -900.0, 'category': 'Dining Out'},
+        ])
+        
+        report = self.advisor.analyze_budget(self.financial_data)
+        self.assertEqual(self.advisor.analyze_budget(with_transactions), report)
+        self.assertIn("$3,000", report)
+        self.assertNotIn("Current Split", report)
+
+    @unittest.skipUnless(agents.LANGCHAIN_AVAILABLE, "langchain not installed")
+    def test_prompt_carries_only_totals_and_categories(self):
+        self.assertEqual(sorted(self.advisor.prompt_template.input_variables), ["categories", "expenses", "income"])
+        
+        prompt = self.advisor.build_ai_prompt(self.financial_data)
+        self.assertIn("Dining Out", prompt)
+        self.assertNotIn("Current Split", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()
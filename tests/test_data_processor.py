@@ -0,0 +1,174 @@
+"""Tests for data_processor.py - run with: python -m unittest discover tests"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_processor
+from data_processor import FinancialDataProcessor
+
+
+@unittest.skipUnless(data_processor.DOCX_AVAILABLE, "python-docx not installed")
+class DocxTableRowsTest(unittest.TestCase):
+    """Word table extraction must match python-docx's row.cells layout"""
+
+    def _merged_table(self):
+        from docx import Document
+        
+        table = Document().add_table(rows=4, cols=3)
+        for row_index, row in enumerate(table.rows):
+            for column_index, cell in enumerate(row.cells):
+                cell.text = f"r{row_index}c{column_index}"
+        
+        table.cell(0, 0).merge(table.cell(0, 2))   # header spanning all columns
+        table.cell(0, 0).text = "Monthly Budget"
+        table.cell(1, 0).merge(table.cell(2, 0))   # category spanning two rows
+        table.cell(1, 0).text = "Housing"
+        table.cell(3, 1).merge(table.cell(3, 2))   # amount spanning two columns
+        table.cell(3, 1).text = "$1,230.00"
+        return table
+
+    def test_merged_cells_match_row_cells(self):
+        table = self._merged_table()
+        expected = [[cell.text.strip() for cell in row.cells] for row in table.rows]
+        
+        self.assertEqual(FinancialDataProcessor._docx_table_rows(table._tbl), expected)
+        self.assertEqual(expected[0], ["Monthly Budget"] * 3)
+        self.assertEqual([row[0] for row in expected[1:3]], ["Housing", "Housing"])
+        self.assertEqual(expected[3][1:], ["$1,230.00", "$1,230.00"])
+
+    def test_plain_table_matches_row_cells(self):
+        from docx import Document
+        
+        table = Document().add_table(rows=2, cols=2)
+        for row_index, row in enumerate(table.rows):
+            for column_index, cell in enumerate(row.cells):
+                cell.text = f" ${row_index * 100 + column_index} "
+        expected = [[cell.text.strip() for cell in row.cells] for row in table.rows]
+        
+        self.assertEqual(FinancialDataProcessor._docx_table_rows(table._tbl), expected)
+
+
+@unittest.skipUnless(data_processor.PANDAS_AVAILABLE, "pandas not installed")
+class CsvEncodingTest(unittest.TestCase):
+    """Non-UTF-8 CSVs must decode through the fallback order, not a statistical guess"""
+
+    ROWS = "Date,Description,Amount\n2024-01-02,naïve bakery,-5.00\n2024-01-03,Crème brûlée,-12.50\n2024-01-04,Señor Taco,-9.99\n2024-01-05,Salary,3000.00\n"
+    DESCRIPTIONS = ("naïve bakery", "Crème brûlée", "Señor Taco", "Salary")
+
+    def _csv_file(self, encoding):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "wb") as file:
+            file.write(self.ROWS.encode(encoding))
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _descriptions(self, path):
+        result = FinancialDataProcessor().process_document(path)
+        return [transaction['description'] for transaction in result['transactions']]
+
+    def test_latin1_csv_keeps_accented_descriptions(self):
+        path = self._csv_file("latin-1")
+        
+        self.assertIsNone(FinancialDataProcessor()._sniff_encoding(path))
+        self.assertEqual(self._descriptions(path), list(self.DESCRIPTIONS))
+
+    def test_utf8_and_bom_files_are_recognized(self):
+        for encoding, sniffed in (("utf-8", "utf-8"), ("utf-8-sig", "utf-8-sig"), ("utf-16", "utf-16")):
+            path = self._csv_file(encoding)
+            
+            self.assertEqual(FinancialDataProcessor()._sniff_encoding(path), sniffed)
+            self.assertEqual(self._descriptions(path), list(self.DESCRIPTIONS))
+
+
+@unittest.skipUnless(data_processor.PANDAS_AVAILABLE, "pandas not installed")
+class LazyPandasTest(unittest.TestCase):
+    """Helpers must load pandas themselves - nothing may depend on an earlier call binding pd/np"""
+
+    def setUp(self):
+        # Forget any pandas binding a previous test left behind
+        for name in ("pd", "np"):
+            vars(data_processor).pop(name, None)
+        data_processor._load_pandas.cache_clear()
+        self.processor = FinancialDataProcessor()
+
+    def test_clean_amount_column_without_prior_load(self):
+        import pandas as pd
+        
+        amounts, valid = self.processor._clean_amount_column(pd.Series(["$1,200.50", "(45.10)", "abc", None]))
+        
+        self.assertEqual(list(amounts[:2]), [1200.5, -45.1])
+        self.assertEqual(list(valid), [True, True, False, False])
+
+    def test_summarize_transactions_without_prior_load(self):
+        financial_data = {}
+        self.processor._summarize_transactions(financial_data, [3000.0, -1200.0, -45.1], ["Income", "Housing", "Food"])
+        
+        self.assertEqual(financial_data["total_income"], 3000.0)
+        self.assertAlmostEqual(financial_data["total_expenses"], 1245.1)
+        self.assertEqual(financial_data["categories"], {"Income": 3000.0, "Housing": 1200.0, "Food": 45.1})
+
+    def test_build_transaction_columns_without_prior_load(self):
+        columns = data_processor.build_transaction_columns(
+            {"transactions": [{"amount": -5.0, "category": "Food", "date": "2024-01-01", "description": "Lunch"}]}
+        )
+        
+        self.assertEqual(list(columns["amounts"]), [-5.0])
+        self.assertEqual(columns["category_names"], ["Food"])
+
+
+@unittest.skipUnless(data_processor.PANDAS_AVAILABLE, "pandas not installed")
+class DataQualityIssuesTest(unittest.TestCase):
+    """Rows the vectorized extractor rejects or can't date are reported, not silently dropped"""
+
+    ROWS = ("Date,Description,Amount\n2024-01-02,Coffee,-4.50\nnot a date,Lunch,-12.00\n"
+            "2024-01-04,Refund,abc\n,Groceries,-30.00\n2024-01-06,Salary,3000\n2024-01-07,Blank,\n")
+    EXPECTED_ISSUES = (
+        "2 row(s): amount missing or not a number - row skipped (rows 2, 5)",
+        "2 row(s): date missing or unreadable - kept as written (rows 1, 3)",
+    )
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as file:
+            file.write(self.ROWS)
+        self.addCleanup(os.remove, self.path)
+
+    def test_issues_reported(self):
+        processing_info = FinancialDataProcessor().process_document(self.path)['processing_info']
+        
+        self.assertEqual(processing_info['skipped_rows'], 2)
+        self.assertEqual(processing_info['data_quality_issues'], list(self.EXPECTED_ISSUES))
+
+    def test_streamed_chunks_report_the_same_issues(self):
+        processor = FinancialDataProcessor()
+        processor.CSV_CHUNK_MIN_BYTES = 0
+        processor.CSV_CHUNK_ROWS = 2
+        
+        processing_info = processor.process_document(self.path)['processing_info']
+        self.assertEqual(processing_info['data_quality_issues'], list(self.EXPECTED_ISSUES))
+
+
+class PdfTextPatternsTest(unittest.TestCase):
+    """Each date layout is scanned on its own, so overlapping matches are all found"""
+
+    def test_amounts_and_dates_per_layout(self):
+        patterns = FinancialDataProcessor()._analyze_pdf_text(
+            "Paid $1,200.50 on 01/15/2024 and 2024-02-01\nTransfer 03-04-2024 $45"
+        )
+        
+        self.assertEqual(patterns['amounts'], [1200.5, 45.0])
+        self.assertEqual(patterns['dates'], ["01/15/2024", "03-04-2024", "2024-02-01"])
+
+    def test_overlapping_matches_are_kept(self):
+        patterns = FinancialDataProcessor()._analyze_pdf_text("ref 12-01-2024-05-06 and $12/05/2024")
+        
+        self.assertEqual(patterns['amounts'], [12.0])
+        self.assertEqual(patterns['dates'], ["12/05/2024", "12-01-2024", "2024-05-06"])
+
+
+if __name__ == "__main__":
+    unittest.main()